@@ -12,12 +12,29 @@ class Settings:
     # Database Settings
     DATABASE_URL: str = os.getenv(
         "DATABASE_URL", 
-        "sqlite:///./test.db"
+        "sqlite+aiosqlite:///./test.db"
     )
     
+    # Connection pool settings (ignored for in-memory SQLite)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    # Seconds before a pooled connection is replaced (avoids server-side idle timeouts)
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    
+    # Cache Settings (caching is disabled when REDIS_URL is not set)
+    REDIS_URL: Optional[str] = os.getenv("REDIS_URL")
+    STATS_CACHE_TTL: int = int(os.getenv("STATS_CACHE_TTL", "60"))
+    ENTITY_CACHE_TTL: int = int(os.getenv("ENTITY_CACHE_TTL", "300"))
+    # Per-worker in-process cache in front of Redis (0 disables it)
+    LOCAL_CACHE_SIZE: int = int(os.getenv("LOCAL_CACHE_SIZE", "1024"))
+    LOCAL_CACHE_TTL: int = int(os.getenv("LOCAL_CACHE_TTL", "60"))
+    
     # Server Settings
     HOST: str = os.getenv("HOST", "0.0.0.0")
     PORT: int = int(os.getenv("PORT", "8000"))
+    WORKERS: int = int(os.getenv("WORKERS", str(os.cpu_count() or 2)))
+    # Create the schema from the app's startup hook (otherwise run scripts/init_db.py)
+    RUN_MIGRATIONS: bool = os.getenv("RUN_MIGRATIONS", "false").lower() in ("1", "true", "yes")
     
     # CORS Settings
     BACKEND_CORS_ORIGINS: list = ["*"]
@@ -27,8 +44,19 @@ class Settings:
     GENERATE_SERVICES_COUNT: int = int(os.getenv("GENERATE_SERVICES_COUNT", "500"))
     GENERATE_BOOKINGS_COUNT: int = int(os.getenv("GENERATE_BOOKINGS_COUNT", "5000"))
     
+    BULK_INSERT_BATCH_SIZE: int = int(os.getenv("BULK_INSERT_BATCH_SIZE", "1000"))
+    
     # Pagination Settings
     DEFAULT_PAGE_SIZE: int = int(os.getenv("DEFAULT_PAGE_SIZE", "100"))
     MAX_PAGE_SIZE: int = int(os.getenv("MAX_PAGE_SIZE", "1000"))
+    # /logs pages larger than this are streamed as NDJSON
+    LOG_STREAM_THRESHOLD: int = int(os.getenv("LOG_STREAM_THRESHOLD", "1000"))
+    
+    # Log Review Settings
+    # File served by /logs; the application log holds user PII, so point this
+    # at it only deliberately
+    LOG_VIEW_PATH: str = os.getenv("LOG_VIEW_PATH", "dummy_logs.log")
+    # Key required in the X-API-Key header for /logs (endpoint disabled when unset)
+    LOGS_API_KEY: Optional[str] = os.getenv("LOGS_API_KEY")
 
 settings = Settings()
@@ -1,15 +1,83 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, func, or_
-from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, bindparam, delete, exists, func, insert, literal, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import IntegrityError
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
 from datetime import datetime, timedelta
-from models.booking import Booking, BookingCreate, BookingUpdate, BookingStatus
+from models.booking import Booking, BookingCreate, BookingResponse, BookingUpdate, BookingStatus
 from models.user import User
 from models.service import Service
+from models.counter import Counter
 import logging
 
+from config import settings
+from utils.interval_index import IntervalIndex
+from utils.cache import (
+    BOOKING_STATS_KEY,
+    USER_STATS_KEY,
+    booking_key,
+    cached,
+    get_or_load,
+    invalidate,
+)
+
 logger = logging.getLogger("BookingServicesAPI")
 
-async def create_booking(db: Session, booking: BookingCreate) -> Booking:
+# Exactly the columns BookingResponse renders; list reads fetch these as plain rows
+BOOKING_LIST_COLUMNS = tuple(getattr(Booking, name) for name in BookingResponse.model_fields)
+
+# Counter row holding the revenue and number of completed bookings
+COMPLETED_REVENUE = "completed_revenue"
+
+async def _rebuild_completed_revenue(db: AsyncSession) -> bool:
+    """Create the counter row from the bookings this transaction sees, in one
+    INSERT ... SELECT. False when another transaction created it first.
+    """
+    try:
+        async with db.begin_nested():
+            await db.execute(
+                insert(Counter).from_select(
+                    ["name", "total", "count"],
+                    select(
+                        literal(COMPLETED_REVENUE),
+                        func.coalesce(func.sum(Booking.total_price), 0),
+                        func.count(Booking.id)
+                    ).where(Booking.status == BookingStatus.COMPLETED)
+                )
+            )
+        return True
+    except IntegrityError:
+        return False
+
+async def _adjust_completed_revenue(db: AsyncSession, total_delta: int, count_delta: int) -> None:
+    """Shift the completed-revenue counter in place.
+    Call after the booking change: a missing row is rebuilt in the same
+    transaction, so the rebuilt totals already include this change.
+    """
+    if not (total_delta or count_delta):
+        return
+    stmt = update(Counter).where(Counter.name == COMPLETED_REVENUE).values(
+        total=Counter.total + total_delta,
+        count=Counter.count + count_delta
+    )
+    result = await db.execute(stmt)
+    if result.rowcount == 0 and not await _rebuild_completed_revenue(db):
+        # Created concurrently from a snapshot without this change
+        await db.execute(stmt)
+
+async def _completed_revenue(db: AsyncSession) -> Tuple[int, int]:
+    """(revenue, count) of completed bookings, rebuilding the counter if absent"""
+    query = select(Counter.total, Counter.count).where(Counter.name == COMPLETED_REVENUE)
+    counter = (await db.execute(query)).one_or_none()
+    if counter is None:
+        if await _rebuild_completed_revenue(db):
+            logger.info("DB: counter rebuilt - name=%s", COMPLETED_REVENUE)
+        await db.commit()
+        counter = (await db.execute(query)).one()
+    return counter.total, counter.count
+
+async def create_booking(db: AsyncSession, booking: BookingCreate) -> Booking:
     """Create a new booking"""
     db_booking = Booking(
         user_id=booking.user_id,
@@ -21,171 +89,285 @@ async def create_booking(db: Session, booking: BookingCreate) -> Booking:
         total_price=booking.total_price
     )
     db.add(db_booking)
-    db.commit()
-    db.refresh(db_booking)
-    logger.info(f"DB: booking created - id={db_booking.id} user_id={db_booking.user_id} service_id={db_booking.service_id}")
+    await db.commit()
+    await db.refresh(db_booking)
+    await invalidate(BOOKING_STATS_KEY, USER_STATS_KEY)
+    logger.info("DB: booking created - id=%s user_id=%s service_id=%s", db_booking.id, db_booking.user_id, db_booking.service_id)
     return db_booking
 
-async def get_booking(db: Session, booking_id: int) -> Optional[Booking]:
-    """Get booking by ID"""
-    b = db.query(Booking).filter(Booking.id == booking_id).first()
-    logger.debug(f"DB: booking fetch - id={booking_id} found={bool(b)}")
-    return b
+async def user_and_service_exist(db: AsyncSession, user_id: int, service_id: int) -> Tuple[bool, bool]:
+    """Check a booking's user and service in one round trip"""
+    user_exists, service_exists = (await db.execute(
+        select(
+            exists().where(User.id == user_id),
+            exists().where(Service.id == service_id)
+        )
+    )).one()
+    return bool(user_exists), bool(service_exists)
+
+async def bulk_create_bookings(db: AsyncSession, rows: List[dict]) -> int:
+    """Insert many bookings from plain dicts in executemany batches, committing once"""
+    batch_size = settings.BULK_INSERT_BATCH_SIZE
+    for start in range(0, len(rows), batch_size):
+        await db.execute(insert(Booking), rows[start:start + batch_size])
+    completed = [row["total_price"] for row in rows if row.get("status") == BookingStatus.COMPLETED]
+    await _adjust_completed_revenue(db, sum(completed), len(completed))
+    await db.commit()
+    await invalidate(BOOKING_STATS_KEY, USER_STATS_KEY)
+    logger.info("DB: bookings bulk created - count=%s", len(rows))
+    return len(rows)
+
+async def get_booking(db: AsyncSession, booking_id: int) -> Optional[BookingResponse]:
+    """Get booking by ID, served from the cache when possible"""
+    async def load() -> Optional[Booking]:
+        result = await db.execute(select(Booking).where(Booking.id == booking_id))
+        b = result.scalar_one_or_none()
+        logger.debug("DB: booking fetch - id=%s found=%s", booking_id, bool(b))
+        return b
+    return await get_or_load(booking_key(booking_id), BookingResponse, load, settings.ENTITY_CACHE_TTL)
 
 async def get_bookings(
-    db: Session, 
+    db: AsyncSession, 
     skip: int = 0, 
     limit: int = 100,
     user_id: Optional[int] = None,
     service_id: Optional[int] = None,
-    status_filter: Optional[str] = None
-) -> List[Booking]:
-    """Get all bookings with optional filters"""
-    query = db.query(Booking)
+    status_filter: Optional[BookingStatus] = None
+) -> List[Row]:
+    """Get all bookings with optional filters as read-only column rows (no ORM instances)"""
+    stmt = select(*BOOKING_LIST_COLUMNS)
     
     if user_id:
-        query = query.filter(Booking.user_id == user_id)
+        stmt = stmt.where(Booking.user_id == user_id)
     if service_id:
-        query = query.filter(Booking.service_id == service_id)
+        stmt = stmt.where(Booking.service_id == service_id)
     if status_filter:
-        query = query.filter(Booking.status == status_filter)
+        stmt = stmt.where(Booking.status == status_filter)
     
-    items = query.offset(skip).limit(limit).all()
-    logger.debug(f"DB: bookings fetched - count={len(items)} skip={skip} limit={limit}")
+    stmt = stmt.offset(skip).limit(min(limit, settings.MAX_PAGE_SIZE))
+    items = (await db.execute(stmt)).all()
+    logger.debug("DB: bookings fetched - count=%s skip=%s limit=%s", len(items), skip, limit)
     return items
 
-async def get_bookings_by_user(db: Session, user_id: int, skip: int = 0, limit: int = 100) -> List[Booking]:
+async def get_bookings_by_user(db: AsyncSession, user_id: int, skip: int = 0, limit: int = 100) -> List[Booking]:
     """Get all bookings for a specific user"""
-    return db.query(Booking).filter(Booking.user_id == user_id).offset(skip).limit(limit).all()
+    result = await db.execute(
+        select(Booking).where(Booking.user_id == user_id).offset(skip).limit(limit)
+    )
+    return result.scalars().all()
 
-async def get_bookings_by_service(db: Session, service_id: int, skip: int = 0, limit: int = 100) -> List[Booking]:
+async def get_bookings_by_service(db: AsyncSession, service_id: int, skip: int = 0, limit: int = 100) -> List[Booking]:
     """Get all bookings for a specific service"""
-    return db.query(Booking).filter(Booking.service_id == service_id).offset(skip).limit(limit).all()
+    result = await db.execute(
+        select(Booking).where(Booking.service_id == service_id).offset(skip).limit(limit)
+    )
+    return result.scalars().all()
 
 async def get_bookings_by_date_range(
-    db: Session, 
+    db: AsyncSession, 
     start_date: datetime, 
     end_date: datetime,
     skip: int = 0, 
     limit: int = 100
 ) -> List[Booking]:
     """Get bookings within a date range"""
-    return db.query(Booking).filter(
-        and_(
-            Booking.booking_date >= start_date,
-            Booking.booking_date <= end_date
-        )
-    ).offset(skip).limit(limit).all()
+    result = await db.execute(
+        select(Booking).where(
+            and_(
+                Booking.booking_date >= start_date,
+                Booking.booking_date <= end_date
+            )
+        ).offset(skip).limit(limit)
+    )
+    return result.scalars().all()
 
-async def update_booking(db: Session, booking_id: int, booking: BookingUpdate) -> Optional[Booking]:
-    """Update booking"""
-    db_booking = db.query(Booking).filter(Booking.id == booking_id).first()
+async def update_booking(db: AsyncSession, booking_id: int, booking: BookingUpdate) -> Optional[Booking]:
+    """Update booking in a single UPDATE ... RETURNING"""
+    values = booking.model_dump(exclude_unset=True)
+    if not values:
+        result = await db.execute(select(Booking).where(Booking.id == booking_id))
+        return result.scalar_one_or_none()
+    current = None
+    if values.get("total_price") is not None:
+        # Lock the row so a concurrent status change can't slip between
+        # reading the old price and re-pricing the counter
+        current = (await db.execute(
+            select(Booking.status, Booking.total_price).where(Booking.id == booking_id).with_for_update()
+        )).one_or_none()
+    result = await db.execute(
+        update(Booking).where(Booking.id == booking_id).values(**values).returning(Booking)
+    )
+    db_booking = result.scalar_one_or_none()
+    if current is not None and current.status == BookingStatus.COMPLETED:
+        await _adjust_completed_revenue(db, values["total_price"] - current.total_price, 0)
+    await db.commit()
     if db_booking:
-        for field, value in booking.dict(exclude_unset=True).items():
-            setattr(db_booking, field, value)
-        db.commit()
-        db.refresh(db_booking)
-        logger.info(f"DB: booking updated - id={db_booking.id}")
+        await invalidate(booking_key(booking_id), BOOKING_STATS_KEY)
+        logger.info("DB: booking updated - id=%s", db_booking.id)
     return db_booking
 
-async def update_booking_status(db: Session, booking_id: int, status: str) -> Optional[Booking]:
-    """Update booking status"""
-    db_booking = db.query(Booking).filter(Booking.id == booking_id).first()
+async def update_booking_status(db: AsyncSession, booking_id: int, status: BookingStatus) -> Optional[Booking]:
+    """Update booking status with UPDATE ... RETURNING"""
+    # The first UPDATE only matches a booking crossing into or out of
+    # completed; its WHERE is re-checked under the row lock, so two
+    # concurrent PATCHes can't both move the same revenue
+    if status == BookingStatus.COMPLETED:
+        crossing, sign = Booking.status != BookingStatus.COMPLETED, 1
+    else:
+        crossing, sign = Booking.status == BookingStatus.COMPLETED, -1
+    stmt = update(Booking).values(status=status).returning(Booking)
+    result = await db.execute(stmt.where(and_(Booking.id == booking_id, crossing)))
+    db_booking = result.scalar_one_or_none()
+    if db_booking:
+        await _adjust_completed_revenue(db, sign * db_booking.total_price, sign)
+    else:
+        result = await db.execute(stmt.where(Booking.id == booking_id))
+        db_booking = result.scalar_one_or_none()
+    await db.commit()
     if db_booking:
-        db_booking.status = status
-        db.commit()
-        db.refresh(db_booking)
-        logger.info(f"DB: booking status updated - id={db_booking.id} status={db_booking.status}")
+        await invalidate(booking_key(booking_id), BOOKING_STATS_KEY)
+        logger.info("DB: booking status updated - id=%s status=%s", db_booking.id, db_booking.status.value)
     return db_booking
 
-async def delete_booking(db: Session, booking_id: int) -> bool:
-    """Delete booking"""
-    db_booking = db.query(Booking).filter(Booking.id == booking_id).first()
-    if db_booking:
-        db.delete(db_booking)
-        db.commit()
-        logger.info(f"DB: booking deleted - id={booking_id}")
+async def delete_booking(db: AsyncSession, booking_id: int) -> bool:
+    """Delete booking; RETURNING tells whether the row existed"""
+    result = await db.execute(
+        delete(Booking).where(Booking.id == booking_id).returning(Booking.status, Booking.total_price)
+    )
+    deleted = result.one_or_none()
+    if deleted and deleted.status == BookingStatus.COMPLETED:
+        await _adjust_completed_revenue(db, -deleted.total_price, -1)
+    await db.commit()
+    if deleted:
+        await invalidate(booking_key(booking_id), BOOKING_STATS_KEY, USER_STATS_KEY)
+        logger.info("DB: booking deleted - id=%s", booking_id)
         return True
     return False
 
 async def check_availability(
-    db: Session, 
+    db: AsyncSession, 
     service_id: int, 
     start_time: datetime, 
     end_time: datetime,
     exclude_booking_id: Optional[int] = None
 ) -> bool:
     """Check if a service is available for a given time slot"""
-    query = db.query(Booking).filter(
-        and_(
-            Booking.service_id == service_id,
-            Booking.status.in_([BookingStatus.CONFIRMED, BookingStatus.PENDING]),
-            or_(
-                and_(
-                    Booking.start_time < end_time,
-                    Booking.end_time > start_time
-                )
-            )
-        )
+    conflict = and_(
+        Booking.service_id == service_id,
+        Booking.status.in_([BookingStatus.CONFIRMED, BookingStatus.PENDING]),
+        Booking.start_time < end_time,
+        Booking.end_time > start_time
     )
     
     if exclude_booking_id:
-        query = query.filter(Booking.id != exclude_booking_id)
+        conflict = and_(conflict, Booking.id != exclude_booking_id)
     
-    conflicting_bookings = query.count()
-    return conflicting_bookings == 0
+    # EXISTS stops at the first overlapping booking instead of counting all
+    has_conflict = await db.scalar(select(exists().where(conflict)))
+    return not has_conflict
 
-async def get_booking_stats(db: Session) -> dict:
-    """Get booking statistics"""
-    total_bookings = db.query(Booking).count()
-    
-    # Status distribution
-    status_stats = db.query(
-        Booking.status,
-        func.count(Booking.id).label('count')
-    ).group_by(Booking.status).all()
-    
-    # Monthly trends (last 12 months)
-    current_date = datetime.utcnow()
-    monthly_stats = []
-    for i in range(12):
-        month_start = current_date.replace(day=1) - timedelta(days=i*30)
-        month_end = month_start.replace(day=28) + timedelta(days=4)
-        month_end = month_end.replace(day=1) - timedelta(days=1)
-        
-        month_count = db.query(Booking).filter(
+async def check_availability_many(
+    db: AsyncSession,
+    service_id: int,
+    slots: Sequence[Tuple[datetime, datetime]]
+) -> List[bool]:
+    """Check many candidate slots of one service with a single query.
+
+    Active bookings overlapping the slots' overall window are loaded once
+    into an IntervalIndex; each slot is then answered in O(log N) without
+    another round trip. Intended for slot generation, not as a cache.
+    """
+    if not slots:
+        return []
+    window_start = min(start for start, _ in slots)
+    window_end = max(end for _, end in slots)
+    result = await db.execute(
+        select(Booking.start_time, Booking.end_time).where(
             and_(
-                Booking.booking_date >= month_start,
-                Booking.booking_date <= month_end
+                Booking.service_id == service_id,
+                Booking.status.in_([BookingStatus.CONFIRMED, BookingStatus.PENDING]),
+                Booking.start_time < window_end,
+                Booking.end_time > window_start
             )
-        ).count()
-        
-        monthly_stats.append({
-            "month": month_start.strftime("%Y-%m"),
-            "count": month_count
-        })
+        )
+    )
+    index = IntervalIndex(result.all())
+    return [not index.overlaps(start, end) for start, end in slots]
+
+def _month_bucket(dialect_name: str, column):
+    """SQL expression formatting a datetime column as 'YYYY-MM'"""
+    if dialect_name == "sqlite":
+        return func.strftime("%Y-%m", column)
+    return func.to_char(column, "YYYY-MM")
+
+# Stats statements are built once and only re-bound with parameters per call
+BOOKING_STATUS_STATS = select(
+    Booking.status,
+    func.count(Booking.id).label('count')
+).group_by(Booking.status)
+
+@lru_cache(maxsize=None)
+def _monthly_counts_stmt(dialect_name: str):
+    """Bookings per 'YYYY-MM' between the window_start/window_end parameters"""
+    month = _month_bucket(dialect_name, Booking.booking_date).label('month')
+    return select(month, func.count(Booking.id)).where(
+        and_(
+            Booking.booking_date >= bindparam("window_start"),
+            Booking.booking_date < bindparam("window_end")
+        )
+    ).group_by(month)
+
+def _last_months(current_date: datetime, count: int = 12) -> List[str]:
+    """Calendar months ending with the current one, newest first"""
+    year, month = current_date.year, current_date.month
+    months = []
+    for _ in range(count):
+        months.append(f"{year:04d}-{month:02d}")
+        year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+    return months
+
+@cached(BOOKING_STATS_KEY, ttl=settings.STATS_CACHE_TTL)
+async def get_booking_stats(db: AsyncSession) -> dict:
+    """Get booking statistics"""
+    # Totals and status distribution from one pass over bookings
+    status_stats = (await db.execute(BOOKING_STATUS_STATS)).all()
+    total_bookings = sum(row.count for row in status_stats)
+    # Revenue comes from the maintained counter instead of a SUM scan
+    revenue_total, completed_count = await _completed_revenue(db)
+    total_revenue = float(revenue_total)
     
-    # Revenue stats
-    revenue_stats = db.query(
-        func.sum(Booking.total_price).label('total_revenue'),
-        func.avg(Booking.total_price).label('avg_booking_value')
-    ).filter(Booking.status == BookingStatus.COMPLETED).first()
+    # Monthly trends (last 12 calendar months) in a single GROUP BY
+    current_date = datetime.utcnow()
+    months = _last_months(current_date)
+    oldest_year, oldest_month = (int(part) for part in months[-1].split("-"))
+    window_start = datetime(oldest_year, oldest_month, 1)
+    window_end = (current_date.replace(day=28) + timedelta(days=4)).replace(
+        day=1, hour=0, minute=0, second=0, microsecond=0
+    )
+    month_counts = dict((await db.execute(
+        _monthly_counts_stmt(db.bind.dialect.name),
+        {"window_start": window_start, "window_end": window_end}
+    )).all())
+    monthly_stats = [{"month": m, "count": month_counts.get(m, 0)} for m in months]
     
     return {
         "total_bookings": total_bookings,
-        "status_distribution": {status: count for status, count in status_stats},
+        "status_distribution": {row.status.value: row.count for row in status_stats},
         "monthly_trends": monthly_stats,
         "revenue": {
-            "total": float(revenue_stats.total_revenue) if revenue_stats.total_revenue else 0,
-            "average_per_booking": float(revenue_stats.avg_booking_value) if revenue_stats.avg_booking_value else 0
+            "total": total_revenue,
+            "average_per_booking": total_revenue / completed_count if completed_count else 0
         }
     }
 
-async def get_user_booking_history(db: Session, user_id: int, skip: int = 0, limit: int = 100) -> List[Booking]:
+async def get_user_booking_history(db: AsyncSession, user_id: int, skip: int = 0, limit: int = 100) -> List[Booking]:
     """Get complete booking history for a user"""
-    return db.query(Booking).filter(
-        and_(
-            Booking.user_id == user_id,
-            Booking.status.in_([BookingStatus.COMPLETED, BookingStatus.CANCELLED])
-        )
-    ).order_by(Booking.booking_date.desc()).offset(skip).limit(limit).all()
+    result = await db.execute(
+        select(Booking).where(
+            and_(
+                Booking.user_id == user_id,
+                Booking.status.in_([BookingStatus.COMPLETED, BookingStatus.CANCELLED])
+            )
+        ).order_by(Booking.booking_date.desc()).offset(skip).limit(limit)
+    )
+    return result.scalars().all()
@@ -1,13 +1,20 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, func, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, case, column, delete, exists, func, insert, literal_column, or_, select, table, update
+from sqlalchemy.engine import Row
 from typing import List, Optional
-from models.service import Service, ServiceCreate, ServiceUpdate
+from models.service import Service, ServiceCreate, ServiceResponse, ServiceUpdate
 from models.booking import Booking
 import logging
 
+from config import settings
+from utils.cache import SERVICE_STATS_KEY, cached, get_or_load, invalidate, service_key
+
 logger = logging.getLogger("BookingServicesAPI")
 
-async def create_service(db: Session, service: ServiceCreate) -> Service:
+# Exactly the columns ServiceResponse renders; list reads fetch these as plain rows
+SERVICE_LIST_COLUMNS = tuple(getattr(Service, name) for name in ServiceResponse.model_fields)
+
+async def create_service(db: AsyncSession, service: ServiceCreate) -> Service:
     """Create a new service"""
     db_service = Service(
         name=service.name,
@@ -18,91 +25,149 @@ async def create_service(db: Session, service: ServiceCreate) -> Service:
         is_available=service.is_available
     )
     db.add(db_service)
-    db.commit()
-    db.refresh(db_service)
-    logger.info(f"DB: service created - id={db_service.id} name={db_service.name}")
+    await db.commit()
+    await db.refresh(db_service)
+    await invalidate(SERVICE_STATS_KEY)
+    logger.info("DB: service created - id=%s name=%s", db_service.id, db_service.name)
     return db_service
 
-async def get_service(db: Session, service_id: int) -> Optional[Service]:
-    """Get service by ID"""
-    svc = db.query(Service).filter(Service.id == service_id).first()
-    logger.debug(f"DB: service fetch - id={service_id} found={bool(svc)}")
-    return svc
+async def bulk_create_services(db: AsyncSession, rows: List[dict]) -> List[int]:
+    """Insert many services from plain dicts in executemany batches, committing once.
+    Returns the new ids in the same order as rows.
+    """
+    batch_size = settings.BULK_INSERT_BATCH_SIZE
+    stmt = insert(Service).returning(Service.id, sort_by_parameter_order=True)
+    ids = []
+    for start in range(0, len(rows), batch_size):
+        ids.extend((await db.execute(stmt, rows[start:start + batch_size])).scalars())
+    await db.commit()
+    await invalidate(SERVICE_STATS_KEY)
+    logger.info("DB: services bulk created - count=%s", len(rows))
+    return ids
+
+async def get_service(db: AsyncSession, service_id: int) -> Optional[ServiceResponse]:
+    """Get service by ID, served from the cache when possible"""
+    async def load() -> Optional[Service]:
+        result = await db.execute(select(Service).where(Service.id == service_id))
+        svc = result.scalar_one_or_none()
+        logger.debug("DB: service fetch - id=%s found=%s", service_id, bool(svc))
+        return svc
+    return await get_or_load(service_key(service_id), ServiceResponse, load, settings.ENTITY_CACHE_TTL)
 
-async def get_services(db: Session, skip: int = 0, limit: int = 100) -> List[Service]:
-    """Get all services with pagination"""
-    items = db.query(Service).offset(skip).limit(limit).all()
-    logger.debug(f"DB: services fetched - count={len(items)} skip={skip} limit={limit}")
+async def get_services(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Row]:
+    """Get all services with pagination as read-only column rows (no ORM instances)"""
+    stmt = select(*SERVICE_LIST_COLUMNS).offset(skip).limit(min(limit, settings.MAX_PAGE_SIZE))
+    items = (await db.execute(stmt)).all()
+    logger.debug("DB: services fetched - count=%s skip=%s limit=%s", len(items), skip, limit)
     return items
 
-async def get_services_by_category(db: Session, category: str, skip: int = 0, limit: int = 100) -> List[Service]:
+async def get_services_by_category(db: AsyncSession, category: str, skip: int = 0, limit: int = 100) -> List[Service]:
     """Get services by category"""
-    return db.query(Service).filter(Service.category == category).offset(skip).limit(limit).all()
+    result = await db.execute(
+        select(Service).where(Service.category == category).offset(skip).limit(limit)
+    )
+    return result.scalars().all()
 
-async def get_available_services(db: Session, skip: int = 0, limit: int = 100) -> List[Service]:
+async def get_available_services(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Service]:
     """Get only available services"""
-    return db.query(Service).filter(Service.is_available == True).offset(skip).limit(limit).all()
+    result = await db.execute(
+        select(Service).where(Service.is_available == True).offset(skip).limit(limit)
+    )
+    return result.scalars().all()
 
-async def update_service(db: Session, service_id: int, service: ServiceUpdate) -> Optional[Service]:
-    """Update service"""
-    db_service = db.query(Service).filter(Service.id == service_id).first()
+async def update_service(db: AsyncSession, service_id: int, service: ServiceUpdate) -> Optional[Service]:
+    """Update service in a single UPDATE ... RETURNING"""
+    values = service.model_dump(exclude_unset=True)
+    if not values:
+        result = await db.execute(select(Service).where(Service.id == service_id))
+        return result.scalar_one_or_none()
+    result = await db.execute(
+        update(Service).where(Service.id == service_id).values(**values).returning(Service)
+    )
+    db_service = result.scalar_one_or_none()
+    await db.commit()
     if db_service:
-        for field, value in service.dict(exclude_unset=True).items():
-            setattr(db_service, field, value)
-        db.commit()
-        db.refresh(db_service)
-        logger.info(f"DB: service updated - id={db_service.id}")
+        await invalidate(service_key(service_id), SERVICE_STATS_KEY)
+        logger.info("DB: service updated - id=%s", db_service.id)
     return db_service
 
-async def delete_service(db: Session, service_id: int) -> bool:
-    """Delete service"""
-    db_service = db.query(Service).filter(Service.id == service_id).first()
-    if db_service:
-        db.delete(db_service)
-        db.commit()
-        logger.info(f"DB: service deleted - id={service_id}")
-        return True
-    return False
+async def delete_service(db: AsyncSession, service_id: int) -> Optional[bool]:
+    """Delete a service that has no bookings.
+    Returns True when deleted, False when bookings still reference the service,
+    None when the service does not exist.
+    """
+    # Same guard as delete_user: never leave bookings pointing at a missing service
+    result = await db.execute(
+        delete(Service).where(
+            and_(Service.id == service_id, ~exists().where(Booking.service_id == service_id))
+        ).returning(Service.id)
+    )
+    deleted = result.scalar_one_or_none()
+    if deleted is None:
+        found = await db.scalar(select(exists().where(Service.id == service_id)))
+        await db.rollback()
+        return False if found else None
+    await db.commit()
+    await invalidate(service_key(service_id), SERVICE_STATS_KEY)
+    logger.info("DB: service deleted - id=%s", service_id)
+    return True
+
+SERVICES_FTS = table("services_fts", column("rowid"), column("rank"))
 
-async def search_services(db: Session, query: str, skip: int = 0, limit: int = 100) -> List[Service]:
+def _fts_query(query: str) -> str:
+    """Turn free text into an FTS5 query: every word as a quoted prefix term"""
+    return " ".join('"{}"*'.format(word.replace('"', '""')) for word in query.split())
+
+async def search_services(db: AsyncSession, query: str, skip: int = 0, limit: int = 100) -> List[Service]:
     """Search services by name or description"""
-    search_term = f"%{query}%"
-    return db.query(Service).filter(
-        and_(
-            Service.is_available == True,
-            or_(
-                Service.name.ilike(search_term),
-                Service.description.ilike(search_term)
+    fts_query = _fts_query(query)
+    if db.bind.dialect.name == "sqlite" and fts_query:
+        stmt = select(Service).join(SERVICES_FTS, SERVICES_FTS.c.rowid == Service.id).where(
+            and_(
+                Service.is_available == True,
+                literal_column("services_fts").op("MATCH")(fts_query)
+            )
+        ).order_by(SERVICES_FTS.c.rank)
+    else:
+        search_term = f"%{query}%"
+        stmt = select(Service).where(
+            and_(
+                Service.is_available == True,
+                or_(
+                    Service.name.ilike(search_term),
+                    Service.description.ilike(search_term)
+                )
             )
         )
-    ).offset(skip).limit(limit).all()
+    result = await db.execute(stmt.offset(skip).limit(limit))
+    return result.scalars().all()
 
-async def get_service_stats(db: Session) -> dict:
+@cached(SERVICE_STATS_KEY, ttl=settings.STATS_CACHE_TTL)
+async def get_service_stats(db: AsyncSession) -> dict:
     """Get service statistics"""
-    total_services = db.query(Service).count()
-    available_services = db.query(Service).filter(Service.is_available == True).count()
-    
-    # Get category distribution
-    category_stats = db.query(
-        Service.category,
-        func.count(Service.id).label('count')
-    ).group_by(Service.category).all()
-    
-    # Get price range
-    price_stats = db.query(
-        func.min(Service.price).label('min_price'),
-        func.max(Service.price).label('max_price'),
-        func.avg(Service.price).label('avg_price')
-    ).first()
-    
+    # One GROUP BY pass; overall totals are rolled up from the per-category rows
+    category_stats = (await db.execute(
+        select(
+            Service.category,
+            func.count(Service.id).label('count'),
+            func.sum(case((Service.is_available == True, 1), else_=0)).label('available'),
+            func.min(Service.price).label('min_price'),
+            func.max(Service.price).label('max_price'),
+            func.sum(Service.price).label('price_sum')
+        ).group_by(Service.category)
+    )).all()
+    total_services = sum(row.count for row in category_stats)
+    available_services = sum(row.available or 0 for row in category_stats)
+    price_sum = sum(row.price_sum or 0 for row in category_stats)
+
     return {
         "total_services": total_services,
         "available_services": available_services,
         "unavailable_services": total_services - available_services,
-        "category_distribution": {cat: count for cat, count in category_stats},
+        "category_distribution": {row.category: row.count for row in category_stats},
         "price_range": {
-            "min": float(price_stats.min_price) if price_stats.min_price else 0,
-            "max": float(price_stats.max_price) if price_stats.max_price else 0,
-            "average": float(price_stats.avg_price) if price_stats.avg_price else 0
+            "min": float(min(row.min_price for row in category_stats)) if category_stats else 0,
+            "max": float(max(row.max_price for row in category_stats)) if category_stats else 0,
+            "average": float(price_sum) / total_services if total_services else 0
         }
     }
@@ -1,13 +1,20 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from typing import List, Optional
-from models.user import User, UserCreate, UserUpdate
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, case, delete, exists, func, insert, select, update
+from sqlalchemy.engine import Row
+from typing import List, Optional, Tuple
+from models.user import User, UserCreate, UserResponse, UserUpdate
 from models.booking import Booking
 import logging
 
+from config import settings
+from utils.cache import USER_STATS_KEY, cached, get_or_load, invalidate, user_key
+
 logger = logging.getLogger("BookingServicesAPI")
 
-async def create_user(db: Session, user: UserCreate) -> User:
+# Exactly the columns UserResponse renders; list reads fetch these as plain rows
+USER_LIST_COLUMNS = tuple(getattr(User, name) for name in UserResponse.model_fields)
+
+async def create_user(db: AsyncSession, user: UserCreate) -> User:
     """Create a new user"""
     db_user = User(
         email=user.email,
@@ -16,65 +23,116 @@ async def create_user(db: Session, user: UserCreate) -> User:
         phone=user.phone
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
-    logger.info(f"DB: user created - id={db_user.id} email={db_user.email}")
+    await db.commit()
+    await db.refresh(db_user)
+    await invalidate(USER_STATS_KEY)
+    logger.info("DB: user created - id=%s email=%s", db_user.id, db_user.email)
     return db_user
 
-async def get_user(db: Session, user_id: int) -> Optional[User]:
-    """Get user by ID"""
-    user = db.query(User).filter(User.id == user_id).first()
-    if user:
-        logger.debug(f"DB: user fetched - id={user_id}")
-    else:
-        logger.debug(f"DB: user not found - id={user_id}")
-    return user
+async def bulk_create_users(db: AsyncSession, rows: List[dict]) -> List[int]:
+    """Insert many users from plain dicts in executemany batches, committing once.
+    Returns the new ids in the same order as rows.
+    """
+    batch_size = settings.BULK_INSERT_BATCH_SIZE
+    stmt = insert(User).returning(User.id, sort_by_parameter_order=True)
+    ids = []
+    for start in range(0, len(rows), batch_size):
+        ids.extend((await db.execute(stmt, rows[start:start + batch_size])).scalars())
+    await db.commit()
+    await invalidate(USER_STATS_KEY)
+    logger.info("DB: users bulk created - count=%s", len(rows))
+    return ids
 
-async def get_user_by_email(db: Session, email: str) -> Optional[User]:
+async def get_user(db: AsyncSession, user_id: int) -> Optional[UserResponse]:
+    """Get user by ID, served from the cache when possible"""
+    async def load() -> Optional[User]:
+        result = await db.execute(select(User).where(User.id == user_id))
+        user = result.scalar_one_or_none()
+        if user:
+            logger.debug("DB: user fetched - id=%s", user_id)
+        else:
+            logger.debug("DB: user not found - id=%s", user_id)
+        return user
+    return await get_or_load(user_key(user_id), UserResponse, load, settings.ENTITY_CACHE_TTL)
+
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
     """Get user by email"""
-    return db.query(User).filter(User.email == email).first()
+    result = await db.execute(select(User).where(User.email == email))
+    return result.scalar_one_or_none()
 
-async def get_user_by_username(db: Session, username: str) -> Optional[User]:
+async def get_user_by_username(db: AsyncSession, username: str) -> Optional[User]:
     """Get user by username"""
-    return db.query(User).filter(User.username == username).first()
+    result = await db.execute(select(User).where(User.username == username))
+    return result.scalar_one_or_none()
 
-async def get_users(db: Session, skip: int = 0, limit: int = 100) -> List[User]:
-    """Get all users with pagination"""
-    users = db.query(User).offset(skip).limit(limit).all()
-    logger.debug(f"DB: users fetched - count={len(users)} skip={skip} limit={limit}")
+async def get_users(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Row]:
+    """Get all users with pagination as read-only column rows (no ORM instances)"""
+    stmt = select(*USER_LIST_COLUMNS).offset(skip).limit(min(limit, settings.MAX_PAGE_SIZE))
+    users = (await db.execute(stmt)).all()
+    logger.debug("DB: users fetched - count=%s skip=%s limit=%s", len(users), skip, limit)
     return users
 
-async def update_user(db: Session, user_id: int, user: UserCreate) -> Optional[User]:
-    """Update user"""
-    db_user = db.query(User).filter(User.id == user_id).first()
+async def update_user(db: AsyncSession, user_id: int, user: UserCreate) -> Optional[User]:
+    """Update user in a single UPDATE ... RETURNING"""
+    result = await db.execute(
+        update(User).where(User.id == user_id).values(**user.model_dump()).returning(User)
+    )
+    db_user = result.scalar_one_or_none()
+    await db.commit()
     if db_user:
-        for field, value in user.dict().items():
-            setattr(db_user, field, value)
-        db.commit()
-        db.refresh(db_user)
-        logger.info(f"DB: user updated - id={db_user.id}")
+        await invalidate(user_key(user_id), USER_STATS_KEY)
+        logger.info("DB: user updated - id=%s", db_user.id)
     return db_user
 
-async def delete_user(db: Session, user_id: int) -> bool:
-    """Delete user"""
-    db_user = db.query(User).filter(User.id == user_id).first()
-    if db_user:
-        db.delete(db_user)
-        db.commit()
-        logger.info(f"DB: user deleted - id={user_id}")
-        return True
-    return False
+async def delete_user(db: AsyncSession, user_id: int) -> Optional[bool]:
+    """Delete a user that has no bookings.
+    Returns True when deleted, False when bookings still reference the user,
+    None when the user does not exist.
+    """
+    # The bookings guard is part of the DELETE itself; SQLite does not
+    # enforce the foreign key, so a plain delete would orphan bookings
+    result = await db.execute(
+        delete(User).where(
+            and_(User.id == user_id, ~exists().where(Booking.user_id == user_id))
+        ).returning(User.id)
+    )
+    deleted = result.scalar_one_or_none()
+    if deleted is None:
+        found = await db.scalar(select(exists().where(User.id == user_id)))
+        await db.rollback()
+        return False if found else None
+    await db.commit()
+    await invalidate(user_key(user_id), USER_STATS_KEY)
+    logger.info("DB: user deleted - id=%s", user_id)
+    return True
 
-async def get_users_with_bookings(db: Session, skip: int = 0, limit: int = 100) -> List[User]:
-    """Get users with their booking count"""
-    return db.query(User).offset(skip).limit(limit).all()
+async def get_users_with_bookings(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Tuple[User, int]]:
+    """Get users with their booking count as (user, booking_count) pairs"""
+    result = await db.execute(
+        select(User, func.count(Booking.id).label("booking_count"))
+        .outerjoin(Booking, Booking.user_id == User.id)
+        .group_by(User.id)
+        .order_by(User.id)
+        .offset(skip)
+        .limit(limit)
+    )
+    return [(user, booking_count) for user, booking_count in result.all()]
 
-async def get_user_stats(db: Session) -> dict:
+@cached(USER_STATS_KEY, ttl=settings.STATS_CACHE_TTL)
+async def get_user_stats(db: AsyncSession) -> dict:
     """Get user statistics"""
-    total_users = db.query(User).count()
-    active_users = db.query(User).filter(User.is_active == True).count()
-    users_with_bookings = db.query(User).join(Booking).distinct().count()
-    
+    # One round trip: user counts plus a scalar subquery over bookings
+    totals = (await db.execute(
+        select(
+            func.count(User.id).label('total'),
+            func.sum(case((User.is_active == True, 1), else_=0)).label('active'),
+            select(func.count(func.distinct(Booking.user_id))).scalar_subquery().label('with_bookings')
+        )
+    )).one()
+    total_users = totals.total
+    active_users = totals.active or 0
+    users_with_bookings = totals.with_bookings
+
     return {
         "total_users": total_users,
         "active_users": active_users,
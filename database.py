@@ -1,43 +1,112 @@
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, StaticPool
+import redis.asyncio as redis
 import os
 import logging
 
-# For testing purposes, we'll use SQLite in-memory database
-# In production, you would use PostgreSQL or MySQL
+from config import settings
+from models import Base
+from models.service import Service, create_search_index
+
+# For testing purposes, we'll use SQLite (via the aiosqlite driver)
+# In production, you would use PostgreSQL (postgresql+asyncpg://...) or MySQL
 SQLALCHEMY_DATABASE_URL = os.getenv(
-    "DATABASE_URL", 
-    "sqlite:///./test.db"
+    "DATABASE_URL",
+    "sqlite+aiosqlite:///./test.db"
+)
+
+# Log every SQL statement; only for local debugging, it formats and writes each query
+SQL_ECHO = os.getenv("SQL_ECHO", "false").lower() in ("1", "true", "yes")
+
+# Applied once per pooled connection instead of on every session
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA temp_store=MEMORY",
 )
 
+# In-memory databases have no journal file to tune; skip syncing entirely
+MEMORY_SQLITE_PRAGMAS = (
+    "PRAGMA synchronous=OFF",
+    "PRAGMA temp_store=MEMORY",
+)
+
+def apply_sqlite_pragmas(engine, pragmas=SQLITE_PRAGMAS):
+    """Run pragmas on every new DBAPI connection of an (async) SQLite engine"""
+    @event.listens_for(engine.sync_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
 # Create engine
-if "sqlite" in SQLALCHEMY_DATABASE_URL:
-    engine = create_engine(
+if ":memory:" in SQLALCHEMY_DATABASE_URL:
+    # An in-memory database only exists on its single connection
+    engine = create_async_engine(
         SQLALCHEMY_DATABASE_URL,
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
-        echo=True  # Set to False in production
+        echo=SQL_ECHO
     )
+    apply_sqlite_pragmas(engine, MEMORY_SQLITE_PRAGMAS)
+elif "sqlite" in SQLALCHEMY_DATABASE_URL:
+    # File database: keep a pool of long-lived WAL connections (aiosqlite
+    # defaults to NullPool, i.e. a fresh connection per checkout) so
+    # concurrent readers don't queue behind a single connection
+    engine = create_async_engine(
+        SQLALCHEMY_DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        echo=SQL_ECHO
+    )
+    apply_sqlite_pragmas(engine)
 else:
-    engine = create_engine(
+    engine = create_async_engine(
         SQLALCHEMY_DATABASE_URL,
-        echo=True  # Set to False in production
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=True,
+        echo=SQL_ECHO
     )
 
-# Create SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Create SessionLocal class; objects stay usable after commit so handlers
+# can serialize them without triggering an implicit (sync) refresh
+SessionLocal = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+# Shared Redis client for caching; None when no REDIS_URL is configured
+redis_client = redis.from_url(settings.REDIS_URL) if settings.REDIS_URL else None
+
+def get_redis():
+    return redis_client
+
+def _create_missing_indexes(sync_conn):
+    # create_all only indexes the tables it creates; add indexes declared
+    # later on tables that already exist
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(sync_conn, checkfirst=True)
 
-# Create Base class
-Base = declarative_base()
+async def init_db():
+    """Create all tables and indexes that do not exist yet"""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_create_missing_indexes)
+        # Databases created before the search index existed
+        await conn.run_sync(lambda sync_conn: create_search_index(Service.__table__, sync_conn))
 
 # Dependency to get database session
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with SessionLocal() as db:
         logging.getLogger("BookingServicesAPI").debug("DB session opened")
-        yield db
-    finally:
-        logging.getLogger("BookingServicesAPI").debug("DB session closed")
-        db.close()
+        try:
+            yield db
+        finally:
+            logging.getLogger("BookingServicesAPI").debug("DB session closed")
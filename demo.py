@@ -3,13 +3,17 @@
 Demo script for the Booking Services API
 This script demonstrates how to use the API endpoints
 """
-import requests
+import asyncio
+import httpx
 import json
 from datetime import datetime, timedelta
 
 # API base URL
 BASE_URL = "http://localhost:8000"
 
+# One pooled client is shared by every call so connections are kept alive
+CLIENT_LIMITS = httpx.Limits(max_keepalive_connections=20)
+
 def print_response(response, description):
     """Print formatted API response"""
     print(f"\n{'='*50}")
@@ -18,19 +22,14 @@ def print_response(response, description):
     print(f"Status Code: {response.status_code}")
     print(f"Response: {json.dumps(response.json(), indent=2)}")
 
-def demo_health_check():
-    """Demo health check endpoint"""
-    print("Testing Health Check...")
-    response = requests.get(f"{BASE_URL}/health")
-    print_response(response, "Health Check Response")
-
-def demo_root_endpoint():
-    """Demo root endpoint"""
-    print("Testing Root Endpoint...")
-    response = requests.get(f"{BASE_URL}/")
-    print_response(response, "Root Endpoint Response")
+async def demo_basic_endpoints(client):
+    """Demo health check and root endpoints (requested concurrently)"""
+    print("Testing Health Check and Root Endpoint...")
+    health, root = await asyncio.gather(client.get("/health"), client.get("/"))
+    print_response(health, "Health Check Response")
+    print_response(root, "Root Endpoint Response")
 
-def demo_user_operations():
+async def demo_user_operations(client):
     """Demo user CRUD operations"""
     print("Testing User Operations...")
     
@@ -43,7 +42,7 @@ def demo_user_operations():
     }
     
     print("Creating user...")
-    response = requests.post(f"{BASE_URL}/users/", json=user_data)
+    response = await client.post("/users/", json=user_data)
     print_response(response, "Create User Response")
     
     if response.status_code == 201:
@@ -51,7 +50,7 @@ def demo_user_operations():
         
         # Get user by ID
         print("Getting user by ID...")
-        response = requests.get(f"{BASE_URL}/users/{user_id}")
+        response = await client.get(f"/users/{user_id}")
         print_response(response, "Get User Response")
         
         # Update user
@@ -62,14 +61,14 @@ def demo_user_operations():
             "phone": "555-9999"
         }
         print("Updating user...")
-        response = requests.put(f"{BASE_URL}/users/{user_id}", json=update_data)
+        response = await client.put(f"/users/{user_id}", json=update_data)
         print_response(response, "Update User Response")
         
         return user_id
     
     return None
 
-def demo_service_operations():
+async def demo_service_operations(client):
     """Demo service CRUD operations"""
     print("Testing Service Operations...")
     
@@ -84,7 +83,7 @@ def demo_service_operations():
     }
     
     print("Creating service...")
-    response = requests.post(f"{BASE_URL}/services/", json=service_data)
+    response = await client.post("/services/", json=service_data)
     print_response(response, "Create Service Response")
     
     if response.status_code == 201:
@@ -92,14 +91,14 @@ def demo_service_operations():
         
         # Get service by ID
         print("Getting service by ID...")
-        response = requests.get(f"{BASE_URL}/services/{service_id}")
+        response = await client.get(f"/services/{service_id}")
         print_response(response, "Get Service Response")
         
         return service_id
     
     return None
 
-def demo_booking_operations(user_id, service_id):
+async def demo_booking_operations(client, user_id, service_id):
     """Demo booking CRUD operations"""
     if not user_id or not service_id:
         print("Cannot create booking without user and service IDs")
@@ -123,7 +122,7 @@ def demo_booking_operations(user_id, service_id):
     }
     
     print("Creating booking...")
-    response = requests.post(f"{BASE_URL}/bookings/", json=booking_data)
+    response = await client.post("/bookings/", json=booking_data)
     print_response(response, "Create Booking Response")
     
     if response.status_code == 201:
@@ -131,97 +130,104 @@ def demo_booking_operations(user_id, service_id):
         
         # Get booking by ID
         print("Getting booking by ID...")
-        response = requests.get(f"{BASE_URL}/bookings/{booking_id}")
+        response = await client.get(f"/bookings/{booking_id}")
         print_response(response, "Get Booking Response")
         
         # Update booking status
         print("Updating booking status...")
-        response = requests.patch(f"{BASE_URL}/bookings/{booking_id}/status?status=confirmed")
+        response = await client.patch(f"/bookings/{booking_id}/status?status=confirmed")
         print_response(response, "Update Booking Status Response")
         
         return booking_id
     
     return None
 
-def demo_statistics():
+async def demo_statistics(client):
     """Demo statistics endpoints"""
     print("Testing Statistics Endpoints...")
     
-    # Get booking statistics
-    print("Getting booking statistics...")
-    response = requests.get(f"{BASE_URL}/stats/bookings")
-    print_response(response, "Booking Statistics Response")
-    
-    # Get service statistics
-    print("Getting service statistics...")
-    response = requests.get(f"{BASE_URL}/stats/services")
-    print_response(response, "Service Statistics Response")
+    # Booking and service statistics are independent, fetch them together
+    print("Getting booking and service statistics...")
+    bookings, services = await asyncio.gather(
+        client.get("/stats/bookings"),
+        client.get("/stats/services")
+    )
+    print_response(bookings, "Booking Statistics Response")
+    print_response(services, "Service Statistics Response")
 
-def demo_filtering_and_pagination():
+async def demo_filtering_and_pagination(client):
     """Demo filtering and pagination"""
     print("Testing Filtering and Pagination...")
     
     # Get users with pagination
     print("Getting users with pagination...")
-    response = requests.get(f"{BASE_URL}/users/?skip=0&limit=5")
+    response = await client.get("/users/?skip=0&limit=5")
     print_response(response, "Users with Pagination Response")
     
     # Get services with pagination
     print("Getting services with pagination...")
-    response = requests.get(f"{BASE_URL}/services/?skip=0&limit=5")
+    response = await client.get("/services/?skip=0&limit=5")
     print_response(response, "Services with Pagination Response")
 
-def demo_error_handling():
+async def demo_error_handling(client):
     """Demo error handling scenarios"""
     print("Testing Error Handling...")
     
     # Try to get non-existent user
     print("Getting non-existent user...")
-    response = requests.get(f"{BASE_URL}/users/99999")
+    response = await client.get("/users/99999")
     print_response(response, "Non-existent User Response")
     
     # Try to get non-existent service
     print("Getting non-existent service...")
-    response = requests.get(f"{BASE_URL}/services/99999")
+    response = await client.get("/services/99999")
     print_response(response, "Non-existent Service Response")
     
     # Try to get non-existent booking
     print("Getting non-existent booking...")
-    response = requests.get(f"{BASE_URL}/bookings/99999")
+    response = await client.get("/bookings/99999")
     print_response(response, "Non-existent Booking Response")
 
-def main():
-    """Main demo function"""
-    print("🚀 Booking Services API Demo")
-    print("Make sure the API server is running on http://localhost:8000")
-    print("Press Enter to continue...")
-    input()
-    
-    try:
+async def run_demo():
+    """Run every demo step over a single keep-alive client"""
+    async with httpx.AsyncClient(base_url=BASE_URL, limits=CLIENT_LIMITS) as client:
         # Test basic endpoints
-        demo_health_check()
-        demo_root_endpoint()
+        await demo_basic_endpoints(client)
         
-        # Test CRUD operations
-        user_id = demo_user_operations()
-        service_id = demo_service_operations()
-        booking_id = demo_booking_operations(user_id, service_id)
+        # Test CRUD operations (user and service are independent)
+        user_id, service_id = await asyncio.gather(
+            demo_user_operations(client),
+            demo_service_operations(client)
+        )
+        booking_id = await demo_booking_operations(client, user_id, service_id)
         
         # Test statistics
-        demo_statistics()
+        await demo_statistics(client)
         
         # Test filtering and pagination
-        demo_filtering_and_pagination()
+        await demo_filtering_and_pagination(client)
         
         # Test error handling
-        demo_error_handling()
+        await demo_error_handling(client)
+        
+        return user_id, service_id, booking_id
+
+def main():
+    """Main demo function"""
+    print("🚀 Booking Services API Demo")
+    print("Make sure the API server is running on http://localhost:8000")
+    print("Press Enter to continue...")
+    input()
+    
+    try:
+        user_id, service_id, booking_id = asyncio.run(run_demo())
         
         print("\n🎉 Demo completed successfully!")
         print(f"Created User ID: {user_id}")
         print(f"Created Service ID: {service_id}")
         print(f"Created Booking ID: {booking_id}")
         
-    except requests.exceptions.ConnectionError:
+    except httpx.ConnectError:
         print("❌ Error: Could not connect to the API server.")
         print("Make sure the server is running on http://localhost:8000")
     except Exception as e:
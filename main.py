@@ -1,27 +1,33 @@
-from fastapi import FastAPI, HTTPException, Depends, status, Request
+from fastapi import FastAPI, HTTPException, Depends, Query, status, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from fastapi.security import APIKeyHeader
 from typing import List, Optional
+from pydantic import TypeAdapter
+import orjson
 import uvicorn
+import asyncio
+import time
 from datetime import datetime, timedelta
 import random
+import secrets
 
-from models.booking import Booking, BookingCreate, BookingUpdate, BookingResponse
+from models.booking import Booking, BookingCreate, BookingUpdate, BookingResponse, BookingStatus
 from models.user import User, UserCreate, UserResponse
 from models.service import Service, ServiceCreate, ServiceResponse
-from database import engine, get_db
+from config import settings
+from database import get_db, init_db
 from crud import booking_crud, user_crud, service_crud
 from utils.data_generator import generate_test_data
-from utils.log_reader import read_logs
+from utils.log_reader import iter_logs, read_logs
 from utils.logger import configure_logging
 
-# Create database tables
-from models import Base
-Base.metadata.create_all(bind=engine)
-
 app = FastAPI(
     title="Booking Services API",
     description="A comprehensive booking services API with proper HTTP status codes",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -35,18 +41,59 @@ app.add_middleware(
 
 logger = configure_logging()
 
+VALID_BOOKING_STATUSES = frozenset(s.value for s in BookingStatus)
+
+# List endpoints validate and encode a whole page in one pydantic-core call
+# instead of FastAPI's per-item response_model pass; `responses=` keeps
+# the item schema in OpenAPI
+USER_LIST_ADAPTER = TypeAdapter(List[UserResponse])
+SERVICE_LIST_ADAPTER = TypeAdapter(List[ServiceResponse])
+BOOKING_LIST_ADAPTER = TypeAdapter(List[BookingResponse])
+
+def not_found(entity: str, entity_id: int) -> ORJSONResponse:
+    """404 response returned directly rather than raised, with the usual detail body"""
+    return ORJSONResponse(
+        status_code=status.HTTP_404_NOT_FOUND,
+        content={"detail": f"{entity} with ID {entity_id} not found"}
+    )
+
+def conflict(detail: str) -> ORJSONResponse:
+    """409 response returned directly, like not_found"""
+    return ORJSONResponse(status_code=status.HTTP_409_CONFLICT, content={"detail": detail})
+
+def list_response(adapter: TypeAdapter, items) -> Response:
+    """Serialize ORM objects or column rows as a JSON array"""
+    return Response(
+        adapter.dump_json(adapter.validate_python(items, from_attributes=True)),
+        media_type="application/json"
+    )
+
+logs_api_key = APIKeyHeader(name="X-API-Key", auto_error=False)
+
+def require_logs_key(api_key: Optional[str] = Depends(logs_api_key)) -> None:
+    """Guard /logs: 403 while no LOGS_API_KEY is configured, 401 for a missing or wrong key"""
+    if not settings.LOGS_API_KEY:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Log access is disabled")
+    if not api_key or not secrets.compare_digest(api_key.encode(), settings.LOGS_API_KEY.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or missing API key",
+            headers={"WWW-Authenticate": "APIKey"},
+        )
+
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-	start = datetime.utcnow()
+	start = time.perf_counter_ns()
 	try:
 		response = await call_next(request)
-		elapsed_ms = int((datetime.utcnow() - start).total_seconds() * 1000)
+		elapsed_ms = (time.perf_counter_ns() - start) // 1_000_000
 		logger.info(
-			f"HTTPRequest - {request.method} {request.url.path} - {response.status_code} - {elapsed_ms}ms"
+			"HTTPRequest - %s %s - %s - %sms",
+			request.method, request.url.path, response.status_code, elapsed_ms
 		)
 		return response
 	except Exception as exc:
-		elapsed_ms = int((datetime.utcnow() - start).total_seconds() * 1000)
+		elapsed_ms = (time.perf_counter_ns() - start) // 1_000_000
 		logger.exception(
 			f"APIError - Unhandled exception - {request.method} {request.url.path} - {elapsed_ms}ms"
 		)
@@ -54,27 +101,32 @@ async def log_requests(request: Request, call_next):
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize test data on startup"""
+    """Optionally create tables on startup; seeding runs once before launch (scripts/seed.py)"""
     logger.info("Application startup initiated")
-    await generate_test_data()
+    if settings.RUN_MIGRATIONS:
+        await init_db()
     logger.info("Application startup completed")
 
+# Static API information, encoded once at import
+ROOT_BYTES = orjson.dumps({
+    "message": "Welcome to Booking Services API",
+    "version": "1.0.0",
+    "status": "running",
+    "endpoints": {
+        "users": "/users",
+        "services": "/services", 
+        "bookings": "/bookings",
+        "docs": "/docs"
+    }
+})
+
+HEALTH_TEMPLATE = {"status": "healthy"}
+
 @app.get("/", response_model=dict)
 async def root():
     """Root endpoint - returns API information"""
-    payload = {
-        "message": "Welcome to Booking Services API",
-        "version": "1.0.0",
-        "status": "running",
-        "endpoints": {
-            "users": "/users",
-            "services": "/services", 
-            "bookings": "/bookings",
-            "docs": "/docs"
-        }
-    }
     logger.info("Root endpoint accessed")
-    return payload
+    return Response(ROOT_BYTES, media_type="application/json")
 
 # User endpoints
 @app.post("/users/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
@@ -82,37 +134,28 @@ async def create_user(user: UserCreate, db=Depends(get_db)):
     """Create a new user - Returns 201 on success"""
     try:
         db_user = await user_crud.create_user(db=db, user=user)
-        logger.info(f"User created - id={db_user.id} email={db_user.email}")
+        logger.info("User created - id=%s email=%s", db_user.id, db_user.email)
         return db_user
     except Exception as e:
-        logger.error(f"DatabaseError - Failed to create user - email={user.email} - error={e}")
+        logger.error("DatabaseError - Failed to create user - email=%s - error=%s", user.email, e)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Failed to create user: {str(e)}"
         )
 
-@app.get("/users/", response_model=List[UserResponse], status_code=status.HTTP_200_OK)
+@app.get("/users/", responses={200: {"model": List[UserResponse]}}, status_code=status.HTTP_200_OK)
 async def get_users(skip: int = 0, limit: int = 100, db=Depends(get_db)):
     """Get all users - Returns 200 on success"""
     users = await user_crud.get_users(db=db, skip=skip, limit=limit)
-    if not users:
-        logger.warning("No users found")
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No users found"
-        )
-    return users
+    return list_response(USER_LIST_ADAPTER, users)
 
 @app.get("/users/{user_id}", response_model=UserResponse, status_code=status.HTTP_200_OK)
 async def get_user(user_id: int, db=Depends(get_db)):
     """Get user by ID - Returns 200 on success, 404 if not found"""
     user = await user_crud.get_user(db=db, user_id=user_id)
     if not user:
-        logger.error(f"LogicError - User not found - id={user_id}")
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"User with ID {user_id} not found"
-        )
+        logger.error("LogicError - User not found - id=%s", user_id)
+        return not_found("User", user_id)
     return user
 
 @app.put("/users/{user_id}", response_model=UserResponse, status_code=status.HTTP_200_OK)
@@ -120,25 +163,22 @@ async def update_user(user_id: int, user: UserCreate, db=Depends(get_db)):
     """Update user - Returns 200 on success, 404 if not found"""
     db_user = await user_crud.update_user(db=db, user_id=user_id, user=user)
     if not db_user:
-        logger.error(f"LogicError - User not found for update - id={user_id}")
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"User with ID {user_id} not found"
-        )
-    logger.info(f"User updated - id={db_user.id}")
+        logger.error("LogicError - User not found for update - id=%s", user_id)
+        return not_found("User", user_id)
+    logger.info("User updated - id=%s", db_user.id)
     return db_user
 
 @app.delete("/users/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_user(user_id: int, db=Depends(get_db)):
-    """Delete user - Returns 204 on success, 404 if not found"""
-    success = await user_crud.delete_user(db=db, user_id=user_id)
-    if not success:
-        logger.error(f"LogicError - User not found for delete - id={user_id}")
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"User with ID {user_id} not found"
-        )
-    logger.info(f"User deleted - id={user_id}")
+    """Delete user - Returns 204 on success, 404 if not found, 409 if the user has bookings"""
+    deleted = await user_crud.delete_user(db=db, user_id=user_id)
+    if deleted is None:
+        logger.error("LogicError - User not found for delete - id=%s", user_id)
+        return not_found("User", user_id)
+    if not deleted:
+        logger.error("LogicError - User has bookings, not deleted - id=%s", user_id)
+        return conflict(f"User with ID {user_id} has bookings")
+    logger.info("User deleted - id=%s", user_id)
     return {"message": "User deleted successfully"}
 
 # Service endpoints
@@ -147,37 +187,28 @@ async def create_service(service: ServiceCreate, db=Depends(get_db)):
     """Create a new service - Returns 201 on success"""
     try:
         db_service = await service_crud.create_service(db=db, service=service)
-        logger.info(f"Service created - id={db_service.id} name={db_service.name}")
+        logger.info("Service created - id=%s name=%s", db_service.id, db_service.name)
         return db_service
     except Exception as e:
-        logger.error(f"DatabaseError - Failed to create service - name={service.name} - error={e}")
+        logger.error("DatabaseError - Failed to create service - name=%s - error=%s", service.name, e)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Failed to create service: {str(e)}"
         )
 
-@app.get("/services/", response_model=List[ServiceResponse], status_code=status.HTTP_200_OK)
+@app.get("/services/", responses={200: {"model": List[ServiceResponse]}}, status_code=status.HTTP_200_OK)
 async def get_services(skip: int = 0, limit: int = 100, db=Depends(get_db)):
     """Get all services - Returns 200 on success"""
     services = await service_crud.get_services(db=db, skip=skip, limit=limit)
-    if not services:
-        logger.warning("No services found")
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No services found"
-        )
-    return services
+    return list_response(SERVICE_LIST_ADAPTER, services)
 
 @app.get("/services/{service_id}", response_model=ServiceResponse, status_code=status.HTTP_200_OK)
 async def get_service(service_id: int, db=Depends(get_db)):
     """Get service by ID - Returns 200 on success, 404 if not found"""
     service = await service_crud.get_service(db=db, service_id=service_id)
     if not service:
-        logger.error(f"LogicError - Service not found - id={service_id}")
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Service with ID {service_id} not found"
-        )
+        logger.error("LogicError - Service not found - id=%s", service_id)
+        return not_found("Service", service_id)
     return service
 
 # Booking endpoints
@@ -186,41 +217,34 @@ async def create_booking(booking: BookingCreate, db=Depends(get_db)):
     """Create a new booking - Returns 201 on success"""
     try:
         # Validate user and service exist
-        user = await user_crud.get_user(db=db, user_id=booking.user_id)
-        if not user:
-            logger.error(f"LogicError - User not found (booking) - id={booking.user_id}")
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"User with ID {booking.user_id} not found"
-            )
+        user_exists, service_exists = await booking_crud.user_and_service_exist(
+            db=db, user_id=booking.user_id, service_id=booking.service_id
+        )
+        if not user_exists:
+            logger.error("LogicError - User not found (booking) - id=%s", booking.user_id)
+            return not_found("User", booking.user_id)
         
-        service = await service_crud.get_service(db=db, service_id=booking.service_id)
-        if not service:
-            logger.error(f"LogicError - Service not found (booking) - id={booking.service_id}")
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Service with ID {booking.service_id} not found"
-            )
+        if not service_exists:
+            logger.error("LogicError - Service not found (booking) - id=%s", booking.service_id)
+            return not_found("Service", booking.service_id)
         
         db_booking = await booking_crud.create_booking(db=db, booking=booking)
-        logger.info(f"Booking created - id={db_booking.id} user_id={db_booking.user_id} service_id={db_booking.service_id}")
+        logger.info("Booking created - id=%s user_id=%s service_id=%s", db_booking.id, db_booking.user_id, db_booking.service_id)
         return db_booking
-    except HTTPException:
-        raise
     except Exception as e:
-        logger.error(f"DatabaseError - Failed to create booking - user_id={booking.user_id} service_id={booking.service_id} - error={e}")
+        logger.error("DatabaseError - Failed to create booking - user_id=%s service_id=%s - error=%s", booking.user_id, booking.service_id, e)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Failed to create booking: {str(e)}"
         )
 
-@app.get("/bookings/", response_model=List[BookingResponse], status_code=status.HTTP_200_OK)
+@app.get("/bookings/", responses={200: {"model": List[BookingResponse]}}, status_code=status.HTTP_200_OK)
 async def get_bookings(
     skip: int = 0, 
     limit: int = 100, 
     user_id: Optional[int] = None,
     service_id: Optional[int] = None,
-    status_filter: Optional[str] = None,
+    status_filter: Optional[BookingStatus] = None,
     db=Depends(get_db)
 ):
     """Get all bookings with optional filters - Returns 200 on success"""
@@ -232,24 +256,15 @@ async def get_bookings(
         service_id=service_id,
         status_filter=status_filter
     )
-    if not bookings:
-        logger.warning("No bookings found for given criteria")
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No bookings found with the specified criteria"
-        )
-    return bookings
+    return list_response(BOOKING_LIST_ADAPTER, bookings)
 
 @app.get("/bookings/{booking_id}", response_model=BookingResponse, status_code=status.HTTP_200_OK)
 async def get_booking(booking_id: int, db=Depends(get_db)):
     """Get booking by ID - Returns 200 on success, 404 if not found"""
     booking = await booking_crud.get_booking(db=db, booking_id=booking_id)
     if not booking:
-        logger.error(f"LogicError - Booking not found - id={booking_id}")
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Booking with ID {booking_id} not found"
-        )
+        logger.error("LogicError - Booking not found - id=%s", booking_id)
+        return not_found("Booking", booking_id)
     return booking
 
 @app.put("/bookings/{booking_id}", response_model=BookingResponse, status_code=status.HTTP_200_OK)
@@ -257,12 +272,9 @@ async def update_booking(booking_id: int, booking: BookingUpdate, db=Depends(get
     """Update booking - Returns 200 on success, 404 if not found"""
     db_booking = await booking_crud.update_booking(db=db, booking_id=booking_id, booking=booking)
     if not db_booking:
-        logger.error(f"LogicError - Booking not found for update - id={booking_id}")
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Booking with ID {booking_id} not found"
-        )
-    logger.info(f"Booking updated - id={db_booking.id}")
+        logger.error("LogicError - Booking not found for update - id=%s", booking_id)
+        return not_found("Booking", booking_id)
+    logger.info("Booking updated - id=%s", db_booking.id)
     return db_booking
 
 @app.delete("/bookings/{booking_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -270,33 +282,32 @@ async def delete_booking(booking_id: int, db=Depends(get_db)):
     """Delete booking - Returns 204 on success, 404 if not found"""
     success = await booking_crud.delete_booking(db=db, booking_id=booking_id)
     if not success:
-        logger.error(f"LogicError - Booking not found for delete - id={booking_id}")
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Booking with ID {booking_id} not found"
-        )
-    logger.info(f"Booking deleted - id={booking_id}")
+        logger.error("LogicError - Booking not found for delete - id=%s", booking_id)
+        return not_found("Booking", booking_id)
+    logger.info("Booking deleted - id=%s", booking_id)
     return {"message": "Booking deleted successfully"}
 
 @app.patch("/bookings/{booking_id}/status", response_model=BookingResponse, status_code=status.HTTP_200_OK)
-async def update_booking_status(booking_id: int, status: str, db=Depends(get_db)):
-    """Update booking status - Returns 200 on success, 404 if not found"""
-    valid_statuses = ["pending", "confirmed", "cancelled", "completed"]
-    if status not in valid_statuses:
-        logger.error(f"ValidationError - Invalid booking status - status={status}")
+async def update_booking_status(
+    booking_id: int,
+    new_status: str = Query(..., alias="status"),
+    db=Depends(get_db)
+):
+    """Update booking status - Returns 200 on success, 400 if invalid, 404 if not found"""
+    if new_status not in VALID_BOOKING_STATUSES:
+        logger.error("ValidationError - Invalid booking status - status=%s", new_status)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid status. Must be one of: {valid_statuses}"
+            detail=f"Invalid status. Must be one of: {[s.value for s in BookingStatus]}"
         )
     
-    db_booking = await booking_crud.update_booking_status(db=db, booking_id=booking_id, status=status)
+    db_booking = await booking_crud.update_booking_status(
+        db=db, booking_id=booking_id, status=BookingStatus(new_status)
+    )
     if not db_booking:
-        logger.error(f"LogicError - Booking not found for status update - id={booking_id}")
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Booking with ID {booking_id} not found"
-        )
-    logger.info(f"Booking status updated - id={db_booking.id} status={db_booking.status}")
+        logger.error("LogicError - Booking not found for status update - id=%s", booking_id)
+        return not_found("Booking", booking_id)
+    logger.info("Booking status updated - id=%s status=%s", db_booking.id, db_booking.status.value)
     return db_booking
 
 # Statistics endpoints
@@ -318,24 +329,54 @@ async def get_service_stats(db=Depends(get_db)):
 @app.get("/health", status_code=status.HTTP_200_OK)
 async def health_check():
     """Health check endpoint - Returns 200 if healthy"""
-    payload = {"status": "healthy", "timestamp": datetime.utcnow().isoformat()}
-    logger.info("Health check OK")
-    return payload
+    # Load balancers poll this constantly; keep it out of the INFO log
+    logger.debug("Health check OK")
+    return {**HEALTH_TEMPLATE, "timestamp": datetime.utcnow().isoformat()}
 
-# Logs endpoint (reads dummy_logs.log for testing/log review)
-@app.get("/logs", status_code=status.HTTP_200_OK)
+# Logs endpoint (reads LOG_VIEW_PATH, dummy_logs.log by default, for log review)
+@app.get("/logs", status_code=status.HTTP_200_OK, dependencies=[Depends(require_logs_key)])
 async def get_logs(
     level: Optional[str] = None,
     query: Optional[str] = None,
     offset: int = 0,
     limit: int = 100,
+    count: bool = False,
 ):
-    """Return lines from dummy_logs.log with optional level filter and pagination."""
-    lines, total = read_logs(level=level, query=query, offset=offset, limit=limit)
+    """Return lines from LOG_VIEW_PATH with optional level filter and pagination.
+    Requires the LOGS_API_KEY in the X-API-Key header;
+    total is only computed with count=true (-1 otherwise), has_more tells
+    whether another page follows; pages above
+    LOG_STREAM_THRESHOLD lines are streamed as NDJSON instead.
+    """
+    if limit > settings.LOG_STREAM_THRESHOLD:
+        lines = iter_logs(level=level, query=query, offset=offset, limit=limit)
+        return StreamingResponse(
+            (orjson.dumps(line) + b"\n" for line in lines),
+            media_type="application/x-ndjson"
+        )
+    # File reads run in the threadpool so they never block the event loop
+    lines, total, has_more = await run_in_threadpool(
+        read_logs, level=level, query=query, offset=offset, limit=limit, count_total=count
+    )
     if not lines:
         # Still 200 for observability tools; include total for clarity
-        return {"total": total, "offset": offset, "limit": limit, "lines": []}
-    return {"total": total, "offset": offset, "limit": limit, "lines": lines}
+        return {"total": total, "offset": offset, "limit": limit, "has_more": False, "lines": []}
+    return {"total": total, "offset": offset, "limit": limit, "has_more": has_more, "lines": lines}
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Create tables and seed once here, before the workers start, so they
+    # never race each other to generate data
+    asyncio.run(init_db())
+    asyncio.run(generate_test_data())
+    uvicorn.run(
+        "main:app",
+        host=settings.HOST,
+        port=settings.PORT,
+        # uvloop/httptools when installed (uvloop has no Windows build),
+        # asyncio/h11 otherwise
+        loop="auto",
+        http="auto",
+        workers=settings.WORKERS,
+        limit_concurrency=1000,
+        timeout_keep_alive=30
+    )
@@ -1,6 +1,7 @@
 from .user import User
 from .service import Service
 from .booking import Booking
+from .counter import Counter
 from .base import Base
 
-__all__ = ["User", "Service", "Booking", "Base"]
+__all__ = ["User", "Service", "Booking", "Counter", "Base"]
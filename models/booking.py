@@ -1,7 +1,7 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Enum
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Text, Enum as SqlEnum, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
 from datetime import datetime
 import enum
@@ -19,20 +19,44 @@ class Booking(Base):
     __tablename__ = "bookings"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
-    service_id = Column(Integer, ForeignKey("services.id"), nullable=False, index=True)
+    # user_id, service_id and status are indexed as the leading columns of
+    # the composite indexes below
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    service_id = Column(Integer, ForeignKey("services.id"), nullable=False)
     booking_date = Column(DateTime, nullable=False, index=True)
     start_time = Column(DateTime, nullable=False)
     end_time = Column(DateTime, nullable=False)
-    status = Column(String, default=BookingStatus.PENDING, index=True)
+    # Stores the enum values ("pending", ...), so existing rows read back unchanged
+    status = Column(
+        SqlEnum(
+            BookingStatus,
+            name="booking_status",
+            native_enum=True,
+            values_callable=lambda statuses: [s.value for s in statuses]
+        ),
+        default=BookingStatus.PENDING,
+        nullable=False
+    )
     notes = Column(Text, nullable=True)
     total_price = Column(Integer, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
-    # Relationships
-    user = relationship("User", backref="bookings")
-    service = relationship("Service", backref="bookings")
+    __table_args__ = (
+        # Availability checks: service + status equality, then time overlap
+        Index("ix_bookings_service_time", "service_id", "status", "start_time", "end_time"),
+        # Per-user listings and history ordered/filtered by date
+        Index("ix_bookings_user_date", "user_id", "booking_date"),
+        # get_bookings filter combinations
+        Index("ix_bookings_user_status", "user_id", "status"),
+        Index("ix_bookings_service_date", "service_id", "booking_date"),
+        Index("ix_bookings_status_date", "status", "booking_date"),
+    )
+
+    # Relationships; never lazy-loaded. BookingResponse renders neither, so
+    # only a query whose result uses them should add selectinload()
+    user = relationship("User", backref="bookings", lazy="raise")
+    service = relationship("Service", backref="bookings", lazy="raise")
 
 # Pydantic Schemas
 class BookingBase(BaseModel):
@@ -56,9 +80,8 @@ class BookingUpdate(BaseModel):
 
 class BookingResponse(BookingBase):
     id: int
-    status: str
+    status: BookingStatus
     created_at: datetime
     updated_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, Integer, String
+from .base import Base
+
+# SQLAlchemy Model
+class Counter(Base):
+    """Running aggregate kept up to date by writes, so reads never scan"""
+    __tablename__ = "counters"
+
+    name = Column(String, primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
+    count = Column(Integer, nullable=False, default=0)
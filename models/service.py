@@ -1,6 +1,6 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, Text, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Float, Text, Boolean, event
 from sqlalchemy.sql import func
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
 from datetime import datetime
 from .base import Base
@@ -19,6 +19,38 @@ class Service(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+# SQLite full-text index over name/description, kept in sync by triggers
+SEARCH_INDEX_DDL = (
+    "CREATE VIRTUAL TABLE services_fts USING fts5("
+    "name, description, content='services', content_rowid='id')",
+    "CREATE TRIGGER services_fts_ai AFTER INSERT ON services BEGIN "
+    "INSERT INTO services_fts(rowid, name, description) VALUES (new.id, new.name, new.description); END",
+    "CREATE TRIGGER services_fts_ad AFTER DELETE ON services BEGIN "
+    "INSERT INTO services_fts(services_fts, rowid, name, description) "
+    "VALUES ('delete', old.id, old.name, old.description); END",
+    "CREATE TRIGGER services_fts_au AFTER UPDATE ON services BEGIN "
+    "INSERT INTO services_fts(services_fts, rowid, name, description) "
+    "VALUES ('delete', old.id, old.name, old.description); "
+    "INSERT INTO services_fts(rowid, name, description) VALUES (new.id, new.name, new.description); END",
+)
+
+def create_search_index(target, connection, **kw):
+    """Create services_fts if missing and populate it from existing rows (SQLite only)"""
+    if connection.dialect.name != "sqlite":
+        return
+    if connection.exec_driver_sql("SELECT 1 FROM sqlite_master WHERE name = 'services_fts'").first():
+        return
+    for statement in SEARCH_INDEX_DDL:
+        connection.exec_driver_sql(statement)
+    connection.exec_driver_sql("INSERT INTO services_fts(services_fts) VALUES ('rebuild')")
+
+def drop_search_index(target, connection, **kw):
+    if connection.dialect.name == "sqlite":
+        connection.exec_driver_sql("DROP TABLE IF EXISTS services_fts")
+
+event.listen(Service.__table__, "after_create", create_search_index)
+event.listen(Service.__table__, "before_drop", drop_search_index)
+
 # Pydantic Schemas
 class ServiceBase(BaseModel):
     name: str
@@ -43,5 +75,4 @@ class ServiceResponse(ServiceBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,12 @@
+"""
+Create the database schema once, before any API worker starts.
+
+Usage: python -m scripts.init_db
+"""
+import asyncio
+
+from database import init_db
+
+if __name__ == "__main__":
+    asyncio.run(init_db())
+    print("Database schema is up to date")
@@ -0,0 +1,12 @@
+"""
+Seed the database with generated test data, once, before the API starts.
+Skips seeding when users already exist.
+
+Usage: python -m scripts.seed
+"""
+import asyncio
+
+from utils.data_generator import generate_test_data
+
+if __name__ == "__main__":
+    asyncio.run(generate_test_data())
@@ -2,7 +2,10 @@
 """
 Startup script for the Booking Services API
 """
+import asyncio
 import uvicorn
+from database import init_db
+from utils.data_generator import generate_test_data
 from main import app
 
 if __name__ == "__main__":
@@ -10,6 +13,9 @@ if __name__ == "__main__":
     print("API will be available at: http://localhost:8000")
     print("Interactive docs: http://localhost:8000/docs")
     print("Press Ctrl+C to stop the server")
+
+    asyncio.run(init_db())
+    asyncio.run(generate_test_data())
     
     uvicorn.run(
         app,
@@ -1,56 +1,107 @@
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_scoped_session, async_sessionmaker, create_async_engine
 from sqlalchemy.pool import StaticPool
+import asyncio
 import os
 import tempfile
+from pathlib import Path
+
+import utils.logger
+
+# Each test process (and so each pytest-xdist worker) logs to its own file
+# instead of prod_logs.log, keeping the single writer the rotation and index need
+utils.logger.LOG_FILE_PATH = Path(tempfile.mkdtemp(prefix="booking-tests-")) / "prod_logs.log"
 
 from main import app
-from database import get_db, Base
+from database import MEMORY_SQLITE_PRAGMAS, Base, apply_sqlite_pragmas, get_db
 from models.user import User, UserCreate
 from models.service import Service, ServiceCreate
 from models.booking import Booking, BookingCreate
+from tests.utils import count_queries
+from config import settings
+from utils.cache import clear_local
 
-# Create test database
-SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+# Create test database; every pytest-xdist worker is its own process and so
+# gets its own private in-memory database
+SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
 
-engine = create_engine(
+engine = create_async_engine(
     SQLALCHEMY_DATABASE_URL,
     connect_args={"check_same_thread": False},
     poolclass=StaticPool,
 )
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+apply_sqlite_pragmas(engine, MEMORY_SQLITE_PRAGMAS)
+
+# pysqlite defers BEGIN and mishandles SAVEPOINT; let SQLAlchemy emit BEGIN
+# itself so each test can be rolled back as one outer transaction
+@event.listens_for(engine.sync_engine, "connect")
+def disable_pysqlite_transactions(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
+
+@event.listens_for(engine.sync_engine, "begin")
+def emit_begin(conn):
+    conn.exec_driver_sql("BEGIN")
+
+TestingSessionLocal = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+# One session per test, shared by all of its requests; removed on teardown
+TestingSession = async_scoped_session(TestingSessionLocal, scopefunc=lambda: "test")
+
+async def create_tables():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
 
-# Create tables
-Base.metadata.create_all(bind=engine)
+async def begin_test_transaction():
+    conn = await engine.connect()
+    trans = await conn.begin()
+    return conn, trans
 
-def override_get_db():
-    try:
-        db = TestingSessionLocal()
-        yield db
-    finally:
-        db.close()
+async def rollback_test_transaction(conn, trans):
+    await TestingSession.remove()
+    await trans.rollback()
+    await conn.close()
+
+# A test's requests share one session, so send them one at a time
+async def override_get_db():
+    yield TestingSession()
 
 app.dependency_overrides[get_db] = override_get_db
 
-client = TestClient(app)
+
+@pytest.fixture(scope="session", autouse=True)
+def test_schema():
+    # Tables are created once; each test runs inside a rolled-back transaction.
+    # The in-memory database disappears with the process, so nothing is dropped
+    asyncio.run(create_tables())
+
+@pytest.fixture(scope="session")
+def client():
+    # Entered once so app startup runs a single time and every test reuses the
+    # same client and portal
+    with TestClient(app) as c:
+        yield c
 
 @pytest.fixture
 def test_db():
-    Base.metadata.create_all(bind=engine)
+    conn, trans = asyncio.run(begin_test_transaction())
+    # Session commits only release a SAVEPOINT inside the outer transaction
+    TestingSessionLocal.configure(bind=conn, join_transaction_mode="create_savepoint")
     yield
-    Base.metadata.drop_all(bind=engine)
+    TestingSessionLocal.configure(bind=engine, join_transaction_mode="conservative_savepoint")
+    asyncio.run(rollback_test_transaction(conn, trans))
+    # Ids are reused once the rows are rolled back
+    clear_local()
 
 class TestHealthCheck:
-    def test_health_check(self):
+    def test_health_check(self, client):
         """Test health check endpoint returns 200"""
         response = client.get("/health")
         assert response.status_code == 200
         assert response.json()["status"] == "healthy"
 
 class TestRootEndpoint:
-    def test_root_endpoint(self):
+    def test_root_endpoint(self, client):
         """Test root endpoint returns 200 with API info"""
         response = client.get("/")
         assert response.status_code == 200
@@ -60,7 +111,7 @@ class TestRootEndpoint:
         assert "endpoints" in data
 
 class TestUserEndpoints:
-    def test_create_user_success(self, test_db):
+    def test_create_user_success(self, client, test_db):
         """Test creating a user returns 201"""
         user_data = {
             "email": "test@example.com",
@@ -75,7 +126,7 @@ class TestUserEndpoints:
         assert data["username"] == user_data["username"]
         assert "id" in data
 
-    def test_create_user_duplicate_email(self, test_db):
+    def test_create_user_duplicate_email(self, client, test_db):
         """Test creating user with duplicate email returns 400"""
         user_data = {
             "email": "test@example.com",
@@ -91,13 +142,13 @@ class TestUserEndpoints:
         response = client.post("/users/", json=user_data)
         assert response.status_code == 400
 
-    def test_get_users_empty(self, test_db):
-        """Test getting users when none exist returns 404"""
+    def test_get_users_empty(self, client, test_db):
+        """Test getting users when none exist returns 200 with an empty list"""
         response = client.get("/users/")
-        assert response.status_code == 404
-        assert "No users found" in response.json()["detail"]
+        assert response.status_code == 200
+        assert response.json() == []
 
-    def test_get_users_with_data(self, test_db):
+    def test_get_users_with_data(self, client, test_db):
         """Test getting users returns 200 with data"""
         # Create a user first
         user_data = {
@@ -114,7 +165,7 @@ class TestUserEndpoints:
         assert len(data) == 1
         assert data[0]["email"] == user_data["email"]
 
-    def test_get_user_by_id_success(self, test_db):
+    def test_get_user_by_id_success(self, client, test_db):
         """Test getting user by ID returns 200"""
         # Create a user first
         user_data = {
@@ -131,13 +182,13 @@ class TestUserEndpoints:
         data = response.json()
         assert data["id"] == user_id
 
-    def test_get_user_by_id_not_found(self, test_db):
+    def test_get_user_by_id_not_found(self, client, test_db):
         """Test getting non-existent user returns 404"""
         response = client.get("/users/999")
         assert response.status_code == 404
         assert "User with ID 999 not found" in response.json()["detail"]
 
-    def test_update_user_success(self, test_db):
+    def test_update_user_success(self, client, test_db):
         """Test updating user returns 200"""
         # Create a user first
         user_data = {
@@ -161,7 +212,20 @@ class TestUserEndpoints:
         data = response.json()
         assert data["email"] == update_data["email"]
 
-    def test_update_user_not_found(self, test_db):
+    def test_get_user_after_update_not_stale(self, client, test_db):
+        """Test a cached user is invalidated by an update"""
+        user_data = {
+            "email": "test@example.com",
+            "username": "testuser",
+            "full_name": "Test User"
+        }
+        user_id = client.post("/users/", json=user_data).json()["id"]
+        assert client.get(f"/users/{user_id}").json()["full_name"] == "Test User"
+
+        client.put(f"/users/{user_id}", json={**user_data, "full_name": "Renamed User"})
+        assert client.get(f"/users/{user_id}").json()["full_name"] == "Renamed User"
+
+    def test_update_user_not_found(self, client, test_db):
         """Test updating non-existent user returns 404"""
         update_data = {
             "email": "updated@example.com",
@@ -171,7 +235,7 @@ class TestUserEndpoints:
         response = client.put("/users/999", json=update_data)
         assert response.status_code == 404
 
-    def test_delete_user_success(self, test_db):
+    def test_delete_user_success(self, client, test_db):
         """Test deleting user returns 204"""
         # Create a user first
         user_data = {
@@ -186,13 +250,45 @@ class TestUserEndpoints:
         response = client.delete(f"/users/{user_id}")
         assert response.status_code == 204
 
-    def test_delete_user_not_found(self, test_db):
+    def test_delete_user_with_bookings_conflict(self, client, test_db):
+        """Test deleting a user that has bookings returns 409 and keeps the bookings"""
+        from datetime import datetime, timedelta
+        user_id = client.post("/users/", json={
+            "email": "test@example.com",
+            "username": "testuser",
+            "full_name": "Test User",
+            "phone": "1234567890"
+        }).json()["id"]
+        service_id = client.post("/services/", json={
+            "name": "Test Service",
+            "description": "A test service",
+            "price": 99.99,
+            "duration_minutes": 60,
+            "category": "Test",
+            "is_available": True
+        }).json()["id"]
+        start_time = (datetime.utcnow() + timedelta(days=1)).replace(hour=10, minute=0)
+        client.post("/bookings/", json={
+            "user_id": user_id,
+            "service_id": service_id,
+            "booking_date": start_time.isoformat(),
+            "start_time": start_time.isoformat(),
+            "end_time": (start_time + timedelta(minutes=60)).isoformat(),
+            "total_price": 99
+        })
+
+        response = client.delete(f"/users/{user_id}")
+        assert response.status_code == 409
+        assert client.get(f"/users/{user_id}").status_code == 200
+        assert [b["user_id"] for b in client.get("/bookings/").json()] == [user_id]
+
+    def test_delete_user_not_found(self, client, test_db):
         """Test deleting non-existent user returns 404"""
         response = client.delete("/users/999")
         assert response.status_code == 404
 
 class TestServiceEndpoints:
-    def test_create_service_success(self, test_db):
+    def test_create_service_success(self, client, test_db):
         """Test creating a service returns 201"""
         service_data = {
             "name": "Test Service",
@@ -208,12 +304,13 @@ class TestServiceEndpoints:
         assert data["name"] == service_data["name"]
         assert data["price"] == service_data["price"]
 
-    def test_get_services_empty(self, test_db):
-        """Test getting services when none exist returns 404"""
+    def test_get_services_empty(self, client, test_db):
+        """Test getting services when none exist returns 200 with an empty list"""
         response = client.get("/services/")
-        assert response.status_code == 404
+        assert response.status_code == 200
+        assert response.json() == []
 
-    def test_get_services_with_data(self, test_db):
+    def test_get_services_with_data(self, client, test_db):
         """Test getting services returns 200 with data"""
         # Create a service first
         service_data = {
@@ -231,7 +328,7 @@ class TestServiceEndpoints:
         data = response.json()
         assert len(data) == 1
 
-    def test_get_service_by_id_success(self, test_db):
+    def test_get_service_by_id_success(self, client, test_db):
         """Test getting service by ID returns 200"""
         # Create a service first
         service_data = {
@@ -250,13 +347,44 @@ class TestServiceEndpoints:
         data = response.json()
         assert data["id"] == service_id
 
-    def test_get_service_by_id_not_found(self, test_db):
+    def test_get_service_by_id_not_found(self, client, test_db):
         """Test getting non-existent service returns 404"""
         response = client.get("/services/999")
         assert response.status_code == 404
 
+class TestServiceSearch:
+    def test_search_services_full_text(self, client, test_db):
+        """Test service search matches word prefixes and follows updates"""
+        from crud import service_crud
+        from models.service import ServiceUpdate
+
+        service_ids = {}
+        for name, description in [("Yoga Class", "Morning stretch"), ("Oil Change", "Car maintenance")]:
+            service_ids[name] = client.post("/services/", json={
+                "name": name,
+                "description": description,
+                "price": 50.0,
+                "duration_minutes": 60,
+                "category": "Test",
+                "is_available": True
+            }).json()["id"]
+
+        async def search(query):
+            async with TestingSessionLocal() as db:
+                return [s.name for s in await service_crud.search_services(db, query)]
+
+        async def rename(service_id, name):
+            async with TestingSessionLocal() as db:
+                await service_crud.update_service(db, service_id, ServiceUpdate(name=name))
+
+        assert asyncio.run(search("yog")) == ["Yoga Class"]
+        assert asyncio.run(search("car")) == ["Oil Change"]
+        asyncio.run(rename(service_ids["Yoga Class"], "Pilates Class"))
+        assert asyncio.run(search("yoga")) == []
+        assert asyncio.run(search("pilates")) == ["Pilates Class"]
+
 class TestBookingEndpoints:
-    def test_create_booking_success(self, test_db):
+    def test_create_booking_success(self, client, test_db):
         """Test creating a booking returns 201"""
         # Create user and service first
         user_data = {
@@ -301,7 +429,7 @@ class TestBookingEndpoints:
         assert data["user_id"] == user_id
         assert data["service_id"] == service_id
 
-    def test_create_booking_user_not_found(self, test_db):
+    def test_create_booking_user_not_found(self, client, test_db):
         """Test creating booking with non-existent user returns 404"""
         # Create service first
         service_data = {
@@ -334,12 +462,13 @@ class TestBookingEndpoints:
         assert response.status_code == 404
         assert "User with ID 999 not found" in response.json()["detail"]
 
-    def test_get_bookings_empty(self, test_db):
-        """Test getting bookings when none exist returns 404"""
+    def test_get_bookings_empty(self, client, test_db):
+        """Test getting bookings when none exist returns 200 with an empty list"""
         response = client.get("/bookings/")
-        assert response.status_code == 404
+        assert response.status_code == 200
+        assert response.json() == []
 
-    def test_get_bookings_with_data(self, test_db):
+    def test_get_bookings_with_data(self, client, test_db):
         """Test getting bookings returns 200 with data"""
         # Create user, service, and booking first
         user_data = {
@@ -348,9 +477,6 @@ class TestBookingEndpoints:
             "full_name": "Test User",
             "phone": "1234567890"
         }
-        user_response = client.post("/users/", json=user_data)
-        user_id = user_response.json()["id"]
-        
         service_data = {
             "name": "Test Service",
             "description": "A test service",
@@ -359,6 +485,9 @@ class TestBookingEndpoints:
             "category": "Test",
             "is_available": True
         }
+        user_response = client.post("/users/", json=user_data)
+        user_id = user_response.json()["id"]
+        
         service_response = client.post("/services/", json=service_data)
         service_id = service_response.json()["id"]
         
@@ -382,7 +511,40 @@ class TestBookingEndpoints:
         data = response.json()
         assert len(data) == 1
 
-    def test_get_booking_by_id_success(self, test_db):
+    def test_get_bookings_query_count(self, client, test_db):
+        """Test listing bookings runs a single query (relations are never loaded)"""
+        from datetime import datetime, timedelta
+        start_time = (datetime.utcnow() + timedelta(days=1)).replace(hour=8, minute=0)
+        for i in range(3):
+            user_id = client.post("/users/", json={
+                "email": f"user{i}@example.com",
+                "username": f"user{i}",
+                "full_name": f"User {i}"
+            }).json()["id"]
+            service_id = client.post("/services/", json={
+                "name": f"Service {i}",
+                "price": 50,
+                "duration_minutes": 60,
+                "category": "Test"
+            }).json()["id"]
+            slot = start_time + timedelta(hours=i)
+            client.post("/bookings/", json={
+                "user_id": user_id,
+                "service_id": service_id,
+                "booking_date": slot.isoformat(),
+                "start_time": slot.isoformat(),
+                "end_time": (slot + timedelta(minutes=60)).isoformat(),
+                "total_price": 50
+            })
+
+        with count_queries(engine.sync_engine) as queries:
+            response = client.get("/bookings/?limit=100")
+        assert response.status_code == 200
+        assert len(response.json()) == 3
+        # BookingResponse renders no relations, so the bookings query is all
+        assert len(queries) == 1
+
+    def test_get_booking_by_id_success(self, client, test_db):
         """Test getting booking by ID returns 200"""
         # Create user, service, and booking first
         user_data = {
@@ -426,12 +588,12 @@ class TestBookingEndpoints:
         data = response.json()
         assert data["id"] == booking_id
 
-    def test_get_booking_by_id_not_found(self, test_db):
+    def test_get_booking_by_id_not_found(self, client, test_db):
         """Test getting non-existent booking returns 404"""
         response = client.get("/bookings/999")
         assert response.status_code == 404
 
-    def test_update_booking_status_success(self, test_db):
+    def test_update_booking_status_success(self, client, test_db):
         """Test updating booking status returns 200"""
         # Create user, service, and booking first
         user_data = {
@@ -476,14 +638,167 @@ class TestBookingEndpoints:
         data = response.json()
         assert data["status"] == "confirmed"
 
-    def test_update_booking_status_invalid(self, test_db):
+    def test_update_booking_status_invalid(self, client, test_db):
         """Test updating booking status with invalid status returns 400"""
         response = client.patch("/bookings/1/status?status=invalid_status")
         assert response.status_code == 400
         assert "Invalid status" in response.json()["detail"]
 
+    def test_update_booking_status_not_found(self, client, test_db):
+        """Test updating the status of a missing booking returns 404"""
+        response = client.patch("/bookings/999/status?status=confirmed")
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Booking with ID 999 not found"
+
+class TestIntervalIndex:
+    def test_overlaps(self):
+        """Test interval index detects overlaps hidden behind a long interval"""
+        from datetime import datetime
+        from utils.interval_index import IntervalIndex
+
+        def at(hour):
+            return datetime(2024, 1, 15, hour)
+
+        index = IntervalIndex([(at(8), at(18)), (at(9), at(10)), (at(20), at(21))])
+        assert index.overlaps(at(12), at(13))
+        assert index.overlaps(at(17), at(20))
+        assert not index.overlaps(at(18), at(20))
+        assert not index.overlaps(at(6), at(8))
+        assert not IntervalIndex([]).overlaps(at(6), at(8))
+
+    def test_check_availability_many(self, client, test_db):
+        """Test batched slot checks against bookings in the database"""
+        from datetime import datetime, timedelta
+        from crud import booking_crud
+
+        day = (datetime.utcnow() + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+
+        def at(hour, minute=0):
+            return day + timedelta(hours=hour, minutes=minute)
+
+        user_id = client.post("/users/", json={
+            "email": "test@example.com",
+            "username": "testuser",
+            "full_name": "Test User"
+        }).json()["id"]
+        service_ids = [client.post("/services/", json={
+            "name": f"Service {i}",
+            "price": 50,
+            "duration_minutes": 60,
+            "category": "Test"
+        }).json()["id"] for i in range(2)]
+
+        def book(service_id, start, end, new_status):
+            booking_id = client.post("/bookings/", json={
+                "user_id": user_id,
+                "service_id": service_id,
+                "booking_date": start.isoformat(),
+                "start_time": start.isoformat(),
+                "end_time": end.isoformat(),
+                "total_price": 50
+            }).json()["id"]
+            if new_status != "pending":
+                client.patch(f"/bookings/{booking_id}/status?status={new_status}")
+
+        book(service_ids[0], at(8), at(9, 45), "confirmed")    # starts before the window
+        book(service_ids[0], at(11), at(12), "cancelled")
+        book(service_ids[0], at(13), at(14), "pending")
+        book(service_ids[0], at(15), at(16), "completed")
+        book(service_ids[1], at(10), at(11), "confirmed")      # another service
+
+        slots = [
+            (at(9, 30), at(10)),
+            (at(10), at(11)),
+            (at(11), at(12)),
+            (at(13, 30), at(14, 30)),
+            (at(15), at(16)),
+        ]
+
+        async def check():
+            async with TestingSessionLocal() as db:
+                return await booking_crud.check_availability_many(db, service_ids[0], slots)
+
+        assert asyncio.run(check()) == [False, True, True, False, True]
+
+class TestLogReader:
+    def test_read_logs_filters_and_pages(self, tmp_path):
+        """Test log reading filters by level/query and pages without a full count"""
+        from utils.log_reader import iter_logs, read_logs
+
+        log_file = tmp_path / "app.log"
+        log_file.write_text("".join(
+            f"2024-01-15T10:00:0{i} [{'ERROR' if i % 2 else 'INFO'}] api - request {i}\n"
+            for i in range(6)
+        ))
+
+        lines, total, has_more = read_logs(path=str(log_file), level="error", offset=1, limit=1)
+        assert total == 3
+        assert has_more
+        assert lines == ["2024-01-15T10:00:03 [ERROR] api - request 3"]
+
+        lines, total, has_more = read_logs(path=str(log_file), query="REQUEST 4", count_total=False)
+        assert total == -1
+        assert not has_more
+        assert lines == ["2024-01-15T10:00:04 [INFO] api - request 4"]
+
+        assert list(iter_logs(path=str(log_file), level="bogus")) == []
+
+    def test_read_logs_uses_level_index(self, tmp_path):
+        """Test level-only reads via the sidecar index match a full scan (single writer)"""
+        import logging
+        from utils.log_reader import index_path, read_logs
+        from utils.logger import IndexedRotatingFileHandler
+
+        log_file = tmp_path / "app.log"
+        log_file.write_text("2024-01-15T09:00:00 [ERROR] api - before handler\n")
+        handler = IndexedRotatingFileHandler(log_file, maxBytes=1024 * 1024, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(name)s - %(message)s"))
+        test_logger = logging.getLogger("BookingServicesAPI.test_index")
+        test_logger.propagate = False
+        test_logger.addHandler(handler)
+        try:
+            for i in range(6):
+                (test_logger.error if i % 2 else test_logger.warning)("request %s", i)
+        finally:
+            test_logger.removeHandler(handler)
+            handler.close()
+
+        assert index_path(log_file).exists()
+        lines, total, has_more = read_logs(path=str(log_file), level="error", offset=1, limit=2)
+        assert total == 4
+        assert has_more
+        assert [line.rsplit(" - ", 1)[1] for line in lines] == ["request 1", "request 3"]
+
+        # Lines from a writer that doesn't index make the reader fall back to scanning
+        with log_file.open("a", encoding="utf-8") as fp:
+            fp.write("2024-01-15T09:00:00 [ERROR] api - unindexed\n")
+        lines, total, _ = read_logs(path=str(log_file), level="error", offset=4)
+        assert total == 5
+        assert lines == ["2024-01-15T09:00:00 [ERROR] api - unindexed"]
+
+        # WARN and WARNING select the same lines with and without the index
+        indexed = read_logs(path=str(log_file), level="warn")
+        with_query = read_logs(path=str(log_file), level="warning", query="request")
+        index_path(log_file).unlink()
+        scanned = read_logs(path=str(log_file), level="warning")
+        assert indexed == with_query == scanned
+        assert scanned[1] == 3
+
+    def test_logs_endpoint_requires_api_key(self, client, monkeypatch):
+        """Test /logs is disabled without a configured key and rejects wrong keys"""
+        monkeypatch.setattr(settings, "LOGS_API_KEY", None)
+        assert client.get("/logs").status_code == 403
+
+        monkeypatch.setattr(settings, "LOGS_API_KEY", "s3cret")
+        assert client.get("/logs").status_code == 401
+        assert client.get("/logs", headers={"X-API-Key": "wrong"}).status_code == 401
+
+        response = client.get("/logs", headers={"X-API-Key": "s3cret"})
+        assert response.status_code == 200
+        assert "lines" in response.json()
+
 class TestStatisticsEndpoints:
-    def test_get_booking_stats(self, test_db):
+    def test_get_booking_stats(self, client, test_db):
         """Test getting booking statistics returns 200"""
         response = client.get("/stats/bookings")
         assert response.status_code == 200
@@ -491,7 +806,54 @@ class TestStatisticsEndpoints:
         assert "total_bookings" in data
         assert "status_distribution" in data
 
-    def test_get_service_stats(self, test_db):
+    def test_get_booking_stats_with_data(self, client, test_db):
+        """Test booking statistics aggregate status, revenue and monthly trends"""
+        user_data = {
+            "email": "test@example.com",
+            "username": "testuser",
+            "full_name": "Test User",
+            "phone": "1234567890"
+        }
+        user_id = client.post("/users/", json=user_data).json()["id"]
+        
+        service_data = {
+            "name": "Test Service",
+            "description": "A test service",
+            "price": 99.99,
+            "duration_minutes": 60,
+            "category": "Test",
+            "is_available": True
+        }
+        service_id = client.post("/services/", json=service_data).json()["id"]
+        
+        from datetime import datetime, timedelta
+        booking_date = datetime.utcnow()
+        booking_data = {
+            "user_id": user_id,
+            "service_id": service_id,
+            "booking_date": booking_date.isoformat(),
+            "start_time": booking_date.isoformat(),
+            "end_time": (booking_date + timedelta(minutes=60)).isoformat(),
+            "total_price": 99
+        }
+        booking_ids = [client.post("/bookings/", json=booking_data).json()["id"] for _ in range(2)]
+        client.patch(f"/bookings/{booking_ids[0]}/status?status=completed")
+        
+        response = client.get("/stats/bookings")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_bookings"] == 2
+        assert data["status_distribution"] == {"completed": 1, "pending": 1}
+        assert data["revenue"] == {"total": 99, "average_per_booking": 99}
+        assert len(data["monthly_trends"]) == 12
+        assert data["monthly_trends"][0] == {"month": booking_date.strftime("%Y-%m"), "count": 2}
+
+        # The revenue counter follows bookings moving out of completed
+        client.patch(f"/bookings/{booking_ids[0]}/status?status=cancelled")
+        data = client.get("/stats/bookings").json()
+        assert data["revenue"] == {"total": 0, "average_per_booking": 0}
+
+    def test_get_service_stats(self, client, test_db):
         """Test getting service statistics returns 200"""
         response = client.get("/stats/services")
         assert response.status_code == 200
@@ -0,0 +1,21 @@
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+# Transaction control issued around each test's SAVEPOINTs is not a query
+TRANSACTION_STATEMENTS = ("BEGIN", "SAVEPOINT", "RELEASE", "ROLLBACK", "COMMIT")
+
+@contextmanager
+def count_queries(conn):
+    """Collect every SQL statement executed on an engine/connection while active"""
+    queries = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if not statement.lstrip().upper().startswith(TRANSACTION_STATEMENTS):
+            queries.append(statement)
+
+    event.listen(conn, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield queries
+    finally:
+        event.remove(conn, "before_cursor_execute", before_cursor_execute)
@@ -0,0 +1,159 @@
+import asyncio
+import functools
+import logging
+import weakref
+from typing import Any, Awaitable, Callable, Optional, Type, TypeVar
+
+import orjson
+from cachetools import TTLCache
+from pydantic import BaseModel
+
+from redis.exceptions import RedisError
+
+from config import settings
+from database import get_redis
+
+logger = logging.getLogger("BookingServicesAPI")
+
+# Every key carries this version prefix, so a change in payload shape
+# never reads entries written by an older deployment
+CACHE_VERSION = "v1"
+
+BOOKING_STATS_KEY = f"{CACHE_VERSION}:stats:bookings"
+SERVICE_STATS_KEY = f"{CACHE_VERSION}:stats:services"
+USER_STATS_KEY = f"{CACHE_VERSION}:stats:users"
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# Per-process L1 in front of Redis for the hottest entity lookups. Each
+# worker has its own copy and only sees its own invalidations, so the TTL
+# must stay short; LOCAL_CACHE_SIZE=0 turns it off.
+_local: Optional[TTLCache] = (
+	TTLCache(maxsize=settings.LOCAL_CACHE_SIZE, ttl=settings.LOCAL_CACHE_TTL)
+	if settings.LOCAL_CACHE_SIZE else None
+)
+
+# One lock per key being loaded; entries vanish once no request holds them
+_load_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+
+def user_key(user_id: int) -> str:
+	return f"{CACHE_VERSION}:user:{user_id}"
+
+
+def service_key(service_id: int) -> str:
+	return f"{CACHE_VERSION}:service:{service_id}"
+
+
+def booking_key(booking_id: int) -> str:
+	return f"{CACHE_VERSION}:booking:{booking_id}"
+
+
+def cached(key: str, ttl: int) -> Callable:
+	"""Cache the JSON-serialisable result of an async function in Redis.
+
+	The key is fixed, so this is meant for whole-table aggregates such as the
+	statistics endpoints. Without Redis, or if Redis errors, the wrapped
+	function is simply called.
+	"""
+	def decorator(func: Callable[..., Awaitable]) -> Callable[..., Awaitable]:
+		@functools.wraps(func)
+		async def wrapper(*args, **kwargs):
+			client = get_redis()
+			if client is None:
+				return await func(*args, **kwargs)
+
+			try:
+				hit = await client.get(key)
+				if hit is not None:
+					return orjson.loads(hit)
+			except RedisError as exc:
+				logger.warning("CacheError - get failed - key=%s - error=%s", key, exc)
+
+			result = await func(*args, **kwargs)
+			try:
+				await client.set(key, orjson.dumps(result), ex=ttl)
+			except RedisError as exc:
+				logger.warning("CacheError - set failed - key=%s - error=%s", key, exc)
+			return result
+
+		return wrapper
+
+	return decorator
+
+
+async def get_model(key: str, model: Type[ModelT]) -> Optional[ModelT]:
+	"""Return the cached response model stored under key, or None on a miss"""
+	client = get_redis()
+	if client is None:
+		return None
+	try:
+		hit = await client.get(key)
+	except RedisError as exc:
+		logger.warning("CacheError - get failed - key=%s - error=%s", key, exc)
+		return None
+	return model.model_validate_json(hit) if hit is not None else None
+
+
+async def set_model(key: str, value: BaseModel, ttl: int) -> None:
+	"""Store a response model under key for ttl seconds"""
+	client = get_redis()
+	if client is None:
+		return
+	try:
+		await client.set(key, value.model_dump_json(), ex=ttl)
+	except RedisError as exc:
+		logger.warning("CacheError - set failed - key=%s - error=%s", key, exc)
+
+
+async def get_or_load(
+	key: str,
+	model: Type[ModelT],
+	loader: Callable[[], Awaitable[Any]],
+	ttl: int
+) -> Any:
+	"""Read key from L1, then Redis, then loader(), filling the caches on the way back.
+
+	Concurrent misses on the same key wait on one lock so only the first
+	runs the loader. Returns the cached model, or whatever loader returned.
+	"""
+	if _local is not None and key in _local:
+		return _local[key]
+
+	lock = _load_locks.get(key)
+	if lock is None:
+		lock = _load_locks[key] = asyncio.Lock()
+	async with lock:
+		if _local is not None and key in _local:
+			return _local[key]
+
+		value = await get_model(key, model)
+		if value is None:
+			loaded = await loader()
+			if loaded is None:
+				return None
+			value = model.model_validate(loaded)
+			await set_model(key, value, ttl)
+		if _local is not None:
+			_local[key] = value
+		return value
+
+
+def clear_local() -> None:
+	"""Empty this process's L1 cache"""
+	if _local is not None:
+		_local.clear()
+
+
+async def invalidate(*keys: str) -> None:
+	"""Drop cached entries after a write, locally and in Redis"""
+	if _local is not None:
+		for key in keys:
+			_local.pop(key, None)
+	client = get_redis()
+	if client is None:
+		return
+	try:
+		await client.delete(*keys)
+	except RedisError as exc:
+		logger.warning("CacheError - delete failed - keys=%s - error=%s", keys, exc)
@@ -1,14 +1,18 @@
 from faker import Faker
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from config import settings
 from database import SessionLocal
+from crud import booking_crud, service_crud, user_crud
 from models.user import User
-from models.service import Service
-from models.booking import Booking, BookingStatus
 from datetime import datetime, timedelta
+from itertools import accumulate
 import random
 import asyncio
 import logging
 
+logger = logging.getLogger("BookingServicesAPI")
+
 fake = Faker()
 
 # Service categories and sample data
@@ -69,130 +73,154 @@ SERVICE_NAMES = {
     ]
 }
 
-async def generate_users(db: Session, count: int = 1000) -> list:
-    """Generate fake users"""
-    users = []
-    for i in range(count):
-        user = User(
+# Weighted booking status distribution, as cumulative weights for random.choices
+STATUS_WEIGHTS = {
+    "completed": 0.4,
+    "confirmed": 0.3,
+    "pending": 0.2,
+    "cancelled": 0.1
+}
+STATUS_KEYS = tuple(STATUS_WEIGHTS)
+STATUS_CUM_WEIGHTS = list(accumulate(STATUS_WEIGHTS.values()))
+
+def _user_rows(count: int) -> list:
+    """Build fake user rows (CPU-bound Faker work)"""
+    # Draw every random field for the whole batch up front
+    active_flags = random.choices([True, False], weights=[3, 1], k=count)  # 75% active
+    return [
+        dict(
             email=fake.unique.email(),
             username=fake.unique.user_name(),
             full_name=fake.name(),
             phone=fake.phone_number(),
-            is_active=random.choice([True, True, True, False])  # 75% active
+            is_active=is_active
         )
-        users.append(user)
-    
-    db.add_all(users)
-    db.commit()
-    logging.getLogger("BookingServicesAPI").info(f"DataGen: users generated - count={len(users)}")
-    return users
+        for is_active in active_flags
+    ]
 
-async def generate_services(db: Session, count: int = 500) -> list:
-    """Generate fake services"""
-    services = []
-    for i in range(count):
-        category = random.choice(SERVICE_CATEGORIES)
-        service_names = SERVICE_NAMES.get(category, ["Generic Service"])
-        name = random.choice(service_names)
-        
-        service = Service(
+def _service_rows(count: int) -> list:
+    """Build fake service rows (CPU-bound Faker work)"""
+    categories = random.choices(SERVICE_CATEGORIES, k=count)
+    durations = random.choices([30, 45, 60, 90, 120, 180], k=count)
+    available_flags = random.choices([True, False], weights=[3, 1], k=count)  # 75% available
+    rows = []
+    for i, category in enumerate(categories):
+        name = random.choice(SERVICE_NAMES.get(category, ["Generic Service"]))
+        rows.append(dict(
             name=f"{name} #{i+1}",
             description=fake.text(max_nb_chars=200),
             price=round(random.uniform(20, 500), 2),
-            duration_minutes=random.choice([30, 45, 60, 90, 120, 180]),
+            duration_minutes=durations[i],
             category=category,
-            is_available=random.choice([True, True, True, False])  # 75% available
-        )
-        services.append(service)
-    
-    db.add_all(services)
-    db.commit()
-    logging.getLogger("BookingServicesAPI").info(f"DataGen: services generated - count={len(services)}")
-    return services
+            is_available=available_flags[i]
+        ))
+    return rows
 
-async def generate_bookings(db: Session, users: list, services: list, count: int = 5000) -> list:
-    """Generate fake bookings"""
+def _booking_rows(users: list, services: list, count: int) -> list:
+    """Build fake booking rows from user ids and service tuples (CPU-bound)"""
     bookings = []
     
     # Generate bookings over the last 2 years
     end_date = datetime.utcnow()
     start_date = end_date - timedelta(days=730)
     
+    # Draw the random picks for all bookings at once instead of per row
+    user_ids = random.choices(users, k=count)
+    # Services are picked by index into flat per-field lists, not per-row tuples
+    service_ids = [service[0] for service in services]
+    service_prices = [service[1] for service in services]
+    service_durations = [service[2] for service in services]
+    service_picks = random.choices(range(len(services)), k=count)
+    days_offsets = random.choices(range(731), k=count)
+    hours = random.choices(range(9, 19), k=count)  # 9 AM to 6 PM
+    minutes = random.choices([0, 15, 30, 45], k=count)
+    statuses = random.choices(STATUS_KEYS, cum_weights=STATUS_CUM_WEIGHTS, k=count)
+    
     for i in range(count):
-        # Random user and service
-        user = random.choice(users)
-        service = random.choice(services)
+        user_id = user_ids[i]
+        s_i = service_picks[i]
+        service_id = service_ids[s_i]
+        service_price = service_prices[s_i]
+        service_duration = service_durations[s_i]
         
         # Random booking date within range
-        days_offset = random.randint(0, 730)
-        booking_date = start_date + timedelta(days=days_offset)
-        
-        # Random time within the day (9 AM to 6 PM)
-        hour = random.randint(9, 18)
-        minute = random.choice([0, 15, 30, 45])
-        start_time = booking_date.replace(hour=hour, minute=minute)
+        booking_date = start_date + timedelta(days=days_offsets[i])
+        start_time = booking_date.replace(hour=hours[i], minute=minutes[i])
         
         # End time based on service duration
-        end_time = start_time + timedelta(minutes=service.duration_minutes)
-        
-        # Random status with weighted distribution
-        status_weights = {
-            "completed": 0.4,
-            "confirmed": 0.3,
-            "pending": 0.2,
-            "cancelled": 0.1
-        }
-        status = random.choices(
-            list(status_weights.keys()),
-            weights=list(status_weights.values())
-        )[0]
+        end_time = start_time + timedelta(minutes=service_duration)
         
         # Calculate total price (service price + random variation)
         price_variation = random.uniform(0.8, 1.2)
-        total_price = int(service.price * price_variation)
+        total_price = int(service_price * price_variation)
         
-        booking = Booking(
-            user_id=user.id,
-            service_id=service.id,
+        booking = dict(
+            user_id=user_id,
+            service_id=service_id,
             booking_date=booking_date,
             start_time=start_time,
             end_time=end_time,
-            status=status,
+            status=statuses[i],
             notes=fake.text(max_nb_chars=100) if random.random() < 0.3 else None,
             total_price=total_price
         )
         bookings.append(booking)
-    
-    db.add_all(bookings)
-    db.commit()
-    logging.getLogger("BookingServicesAPI").info(f"DataGen: bookings generated - count={len(bookings)}")
     return bookings
 
+# Row building runs in a worker thread so seeding from a running server
+# doesn't stall its event loop; only the inserts run on the loop
+
+async def generate_users(db: AsyncSession, count: int = 1000) -> list:
+    """Generate fake users; returns the ids of the inserted users"""
+    rows = await asyncio.to_thread(_user_rows, count)
+    users = await user_crud.bulk_create_users(db, rows)
+    logger.info("DataGen: users generated - count=%s", len(users))
+    return users
+
+async def generate_services(db: AsyncSession, count: int = 500) -> list:
+    """Generate fake services; returns (id, price, duration_minutes) tuples"""
+    rows = await asyncio.to_thread(_service_rows, count)
+    ids = await service_crud.bulk_create_services(db, rows)
+    services = [(sid, row["price"], row["duration_minutes"]) for sid, row in zip(ids, rows)]
+    logger.info("DataGen: services generated - count=%s", len(services))
+    return services
+
+async def generate_bookings(db: AsyncSession, users: list, services: list, count: int = 5000) -> int:
+    """Generate fake bookings from user ids and service tuples; returns how many were inserted"""
+    # Build and insert one batch at a time so only a batch of rows is in memory
+    batch_size = settings.BULK_INSERT_BATCH_SIZE
+    created = 0
+    for start in range(0, count, batch_size):
+        rows = await asyncio.to_thread(_booking_rows, users, services, min(batch_size, count - start))
+        created += await booking_crud.bulk_create_bookings(db, rows)
+    logger.info("DataGen: bookings generated - count=%s", created)
+    return created
+
 async def generate_test_data():
     """Generate comprehensive test data for the application"""
-    logging.getLogger("BookingServicesAPI").info("DataGen: starting")
+    logger.info("DataGen: starting")
     
-    db = SessionLocal()
-    try:
-        # Check if data already exists
-        existing_users = db.query(User).count()
-        if existing_users > 0:
-            logging.getLogger("BookingServicesAPI").info("DataGen: existing data detected, skipping")
-            return
-        
-        # Generate data
-        users = await generate_users(db, count=1000)
-        services = await generate_services(db, count=500)
-        bookings = await generate_bookings(db, users, services, count=5000)
-        
-        logging.getLogger("BookingServicesAPI").info("DataGen: completed successfully")
-        logging.getLogger("BookingServicesAPI").info(f"DataGen: totals users={len(users)} services={len(services)} bookings={len(bookings)}")
-        
-    except Exception as e:
-        logging.getLogger("BookingServicesAPI").error(f"DataGen: error generating data - {e}")
-        db.rollback()
-    finally:
-        db.close()
+    async with SessionLocal() as db:
+        try:
+            # Check if data already exists
+            existing_users = await db.scalar(select(func.count(User.id)))
+            if existing_users > 0:
+                logger.info("DataGen: existing data detected, skipping")
+                return
+            
+            # Generate data
+            users = await generate_users(db, count=1000)
+            services = await generate_services(db, count=500)
+            bookings = await generate_bookings(db, users, services, count=5000)
+            
+            logger.info("DataGen: completed successfully")
+            logger.info(
+                "DataGen: totals users=%s services=%s bookings=%s", len(users), len(services), bookings
+            )
+            
+        except Exception as e:
+            logger.error("DataGen: error generating data - %s", e)
+            await db.rollback()
 
 if __name__ == "__main__":
     asyncio.run(generate_test_data())
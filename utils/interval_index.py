@@ -0,0 +1,28 @@
+from bisect import bisect_left
+from datetime import datetime
+from typing import Iterable, List, Tuple
+
+
+class IntervalIndex:
+	"""Static index answering "does any interval overlap [start, end)?" in O(log N).
+
+	Intervals are sorted by start and paired with a running maximum of their
+	end times. Every interval starting before ``end`` sits in a prefix of the
+	sorted list, so an overlap exists exactly when the largest end time in that
+	prefix is after ``start``.
+	"""
+
+	def __init__(self, intervals: Iterable[Tuple[datetime, datetime]]):
+		ordered = sorted(intervals)
+		self._starts: List[datetime] = [start for start, _ in ordered]
+		self._max_ends: List[datetime] = []
+		for _, end in ordered:
+			self._max_ends.append(max(end, self._max_ends[-1]) if self._max_ends else end)
+
+	def __len__(self) -> int:
+		return len(self._starts)
+
+	def overlaps(self, start: datetime, end: datetime) -> bool:
+		"""True if some indexed interval intersects the half-open range [start, end)"""
+		count = bisect_left(self._starts, end)
+		return count > 0 and self._max_ends[count - 1] > start
@@ -1,52 +1,209 @@
+import logging
+import mmap
+import re
+import struct
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import BinaryIO, Callable, Iterator, List, Optional, Tuple
 
-DEFAULT_LOG_PATH = Path("dummy_logs.log").resolve()
+from config import settings
+
+DEFAULT_LOG_PATH = Path(settings.LOG_VIEW_PATH).resolve()
 
 LEVELS = [
 	"DEBUG",
 	"INFO",
-	"WARN",
+	"WARNING",
 	"ERROR",
 	"CRITICAL",
 ]
 
-def read_logs(
-	path: Optional[str] = None,
-	level: Optional[str] = None,
-	query: Optional[str] = None,
-	offset: int = 0,
-	limit: int = 100,
-) -> Tuple[List[str], int]:
-	"""Read log lines from file with optional level and substring filtering.
-	Returns (lines, total_count_before_pagination).
+# logging writes "[WARNING]"; WARN is accepted as a filter for it
+LEVEL_ALIASES = {"WARN": "WARNING"}
+
+# Lines carry their level as "[INFO]", "[ERROR]", ...; built once at import.
+# Files are scanned as bytes so only the returned lines get decoded
+LEVEL_NEEDLES = {lvl: f"[{lvl}]".encode() for lvl in LEVELS}
+# Any level field; lines without one continue the previous record (tracebacks)
+LEVEL_FIELD = re.compile(rb"\[(" + b"|".join(lvl.encode() for lvl in LEVELS) + rb")\]")
+
+# Sidecar "<log>.idx" written by utils.logger.IndexedRotatingFileHandler: one
+# (levelno, byte offset of the line) record per emitted log line
+INDEX_RECORD = struct.Struct("<BQ")
+LEVEL_NUMBERS = {lvl: logging.getLevelName(lvl) for lvl in LEVELS}
+
+def index_path(log_path: Path) -> Path:
+	return log_path.with_name(log_path.name + ".idx")
+
+def index_is_current(log_path: Path, last_offset: int) -> bool:
+	"""Whether an index whose last record points at last_offset covers the
+	whole log: every line after that record must be a continuation line.
+	Lines appended by a writer that doesn't index (or a replaced file) fail this.
 	"""
-	log_path = Path(path).resolve() if path else DEFAULT_LOG_PATH
-	if not log_path.exists():
-		return [], 0
+	if not log_path.exists() or last_offset >= log_path.stat().st_size:
+		return False
+	with log_path.open("rb") as fp:
+		fp.seek(last_offset)
+		fp.readline()
+		return not any(LEVEL_FIELD.search(line) for line in fp)
+
+@lru_cache(maxsize=128)
+def _query_pattern(query: str) -> "re.Pattern[bytes]":
+	"""Case-insensitive literal matcher, compiled once per distinct query"""
+	return re.compile(re.escape(query.encode("utf-8")), re.IGNORECASE)
+
+def _decode(line: bytes) -> str:
+	return line.rstrip(b"\r\n").decode("utf-8", errors="ignore")
+
+def _level_name(level: str) -> str:
+	name = level.strip().upper()
+	return LEVEL_ALIASES.get(name, name)
+
+def _resolve(path: Optional[str]) -> Path:
+	return Path(path).resolve() if path else DEFAULT_LOG_PATH
 
-	with log_path.open("r", encoding="utf-8", errors="ignore") as fp:
-		all_lines = [line.rstrip("\n") for line in fp]
+def _next_hit(mm: mmap.mmap, pos: int, needle: Optional[bytes], search: Optional[Callable]) -> int:
+	if needle:
+		return mm.find(needle, pos)
+	match = search(mm, pos)
+	# Only the position is kept; a live match would pin the mapping open
+	return match.start() if match else -1
 
-	# Filter by level if provided (expects pattern like "[INFO]", "[ERROR]")
-	filtered = all_lines
+def _mapped_lines(
+	mm: mmap.mmap,
+	needle: Optional[bytes],
+	search: Optional[Callable],
+) -> Iterator[bytes]:
+	"""Jump from hit to hit of the level needle (or the query) in the mapped file,
+	copying out only the lines that contain one
+	"""
+	size = len(mm)
+	pos = 0
+	while pos < size:
+		hit = _next_hit(mm, pos, needle, search)
+		if hit < 0:
+			return
+		start = mm.rfind(b"\n", 0, hit) + 1
+		end = mm.find(b"\n", hit)
+		end = size if end < 0 else end + 1
+		line = mm[start:end]
+		pos = end
+		if needle and search and not search(line):
+			continue
+		yield line
+
+def _matching_lines(
+	fp: BinaryIO,
+	level: Optional[str] = None,
+	query: Optional[str] = None,
+) -> Iterator[bytes]:
+	"""Lazily yield raw lines of a binary file passing the level and substring filters"""
+	needle = None
 	if level:
-		lvl = level.strip().upper()
-		if lvl not in LEVELS:
+		needle = LEVEL_NEEDLES.get(_level_name(level))
+		if needle is None:
 			# Unknown level -> empty result for clarity
-			return [], 0
-		needle = f"[{lvl}]"
-		filtered = [ln for ln in filtered if needle in ln]
+			return
+	# Searching with IGNORECASE avoids a lowercased copy of every line
+	search = _query_pattern(query).search if query else None
+
+	if not needle and not search:
+		yield from fp
+		return
 
-	if query:
-		q = query.lower()
-		filtered = [ln for ln in filtered if q in ln.lower()]
+	# Filtered reads search the page-cache mapping directly instead of
+	# materializing every line of the file
+	try:
+		mm = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+	except ValueError:
+		# Empty file; nothing to map
+		return
+	with mm:
+		yield from _mapped_lines(mm, needle, search)
 
-	total = len(filtered)
+def _indexed_offsets(log_path: Path, level: Optional[str]) -> Optional[List[int]]:
+	"""Byte offsets of every line at level, from the sidecar index.
+	None when there is no usable index and the file has to be scanned.
+	"""
+	levelno = LEVEL_NUMBERS.get(_level_name(level)) if level else None
+	idx_path = index_path(log_path)
+	if levelno is None or not idx_path.exists():
+		return None
+	data = idx_path.read_bytes()
+	data = data[:len(data) - len(data) % INDEX_RECORD.size]
+	if data and not index_is_current(log_path, INDEX_RECORD.unpack_from(data, len(data) - INDEX_RECORD.size)[1]):
+		# Rotated, truncated or appended to without indexing; don't trust it
+		return None
+	return [pos for code, pos in INDEX_RECORD.iter_unpack(data) if code == levelno]
+
+def _read_at(log_path: Path, offsets: List[int]) -> Iterator[str]:
+	with log_path.open("rb") as fp:
+		for pos in offsets:
+			fp.seek(pos)
+			yield _decode(fp.readline())
+
+def _page_bounds(offset: int, limit: int) -> Tuple[int, int]:
 	# Guard rails for pagination
 	if offset < 0:
 		offset = 0
 	if limit <= 0:
 		limit = 100
+	return offset, limit
+
+def iter_logs(
+	path: Optional[str] = None,
+	level: Optional[str] = None,
+	query: Optional[str] = None,
+	offset: int = 0,
+	limit: int = 100,
+) -> Iterator[str]:
+	"""Yield one page of matching log lines, reading the file a line at a time.
+	Stops reading as soon as the page is complete.
+	"""
+	log_path = _resolve(path)
+	if not log_path.exists():
+		return
+	offset, limit = _page_bounds(offset, limit)
+	# A level-only filter can seek straight to the lines via the index
+	offsets = None if query else _indexed_offsets(log_path, level)
+	if offsets is not None:
+		yield from _read_at(log_path, offsets[offset:offset + limit])
+		return
+	with log_path.open("rb") as fp:
+		for line in islice(_matching_lines(fp, level, query), offset, offset + limit):
+			yield _decode(line)
 
-	return filtered[offset : offset + limit], total
+def read_logs(
+	path: Optional[str] = None,
+	level: Optional[str] = None,
+	query: Optional[str] = None,
+	offset: int = 0,
+	limit: int = 100,
+	count_total: bool = True,
+) -> Tuple[List[str], int, bool]:
+	"""Read log lines from file with optional level and substring filtering.
+	Returns (lines, total_count_before_pagination, has_more); total is -1 when
+	count_total is False, which lets the scan stop one line past the page.
+	"""
+	offset, limit = _page_bounds(offset, limit)
+	if not count_total:
+		# One extra line is enough to tell whether another page exists
+		page = list(iter_logs(path, level, query, offset, limit + 1))
+		return page[:limit], -1, len(page) > limit
+
+	log_path = _resolve(path)
+	if not log_path.exists():
+		return [], 0, False
+	offsets = None if query else _indexed_offsets(log_path, level)
+	if offsets is not None:
+		total = len(offsets)
+		return list(_read_at(log_path, offsets[offset:offset + limit])), total, total > offset + limit
+	page: List[str] = []
+	total = 0
+	with log_path.open("rb") as fp:
+		for line in _matching_lines(fp, level, query):
+			if offset <= total < offset + limit:
+				page.append(_decode(line))
+			total += 1
+	return page, total, total > offset + limit
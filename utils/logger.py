@@ -1,15 +1,132 @@
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+import multiprocessing
+import os
+import queue
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 
+from utils.log_reader import INDEX_RECORD, LEVEL_FIELD, index_is_current, index_path
+
+# The formatter never prints thread or process info; don't collect it per record
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+
+
+class FastFormatter(logging.Formatter):
+	"""Formatter stamping records with ISO 8601 UTC times with microseconds.
+	time.strftime can't render %f, so the timestamp is built by hand and the
+	part up to the second is reused for records within the same second.
+	"""
+
+	_second = None
+	_prefix = ""
+
+	def formatTime(self, record, datefmt=None):
+		second = int(record.created)
+		if second != self._second:
+			self._prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+			self._second = second
+		return "%s.%06dZ" % (self._prefix, int((record.created - second) * 1_000_000))
 
 LOG_FILE_PATH = Path("prod_logs.log").resolve()
 
 
+def log_file_path() -> Path:
+	"""File this process logs to. uvicorn's worker processes each get their own
+	prod_logs.<pid>.log: RotatingFileHandler's rollover renames files under
+	any other process writing the same one, and the level index needs a single
+	writer. A single-process server keeps prod_logs.log.
+	"""
+	# Checked by name: spawned workers import __main__ before parent_process() is set
+	if multiprocessing.current_process().name == "MainProcess":
+		return LOG_FILE_PATH
+	return LOG_FILE_PATH.with_name(f"{LOG_FILE_PATH.stem}.{os.getpid()}{LOG_FILE_PATH.suffix}")
+
+
+class IndexedRotatingFileHandler(RotatingFileHandler):
+	"""RotatingFileHandler that also appends (levelno, offset) for each line to
+	a sidecar index, so log_reader can seek to lines of one level
+	instead of scanning the whole file.
+
+	Single process only: offsets come from this process's own stream and the
+	index may be rebuilt on startup, so it must be the log's only writer.
+	configure_logging only uses it when running a single worker.
+	"""
+
+	def __init__(self, filename, *args, **kwargs):
+		super().__init__(filename, *args, **kwargs)
+		self.index_path = index_path(Path(self.baseFilename))
+		if not self._index_current():
+			self._build_index()
+		self._index = self.index_path.open("ab")
+
+	def _index_current(self) -> bool:
+		"""Whether the existing index still describes the log file"""
+		if not self.index_path.exists():
+			return False
+		size = self.index_path.stat().st_size
+		if size % INDEX_RECORD.size:
+			return False
+		log_path = Path(self.baseFilename)
+		if not size:
+			return not log_path.exists() or not log_path.stat().st_size
+		with self.index_path.open("rb") as index:
+			index.seek(-INDEX_RECORD.size, 2)
+			_, offset = INDEX_RECORD.unpack(index.read())
+		return index_is_current(log_path, offset)
+
+	def _build_index(self):
+		# Index lines written before the index existed (continuation lines are skipped)
+		log_path = Path(self.baseFilename)
+		with self.index_path.open("wb") as index:
+			if not log_path.exists():
+				return
+			offset = 0
+			with log_path.open("rb") as fp:
+				for line in fp:
+					match = LEVEL_FIELD.search(line)
+					if match:
+						levelno = logging.getLevelName(match.group(1).decode())
+						index.write(INDEX_RECORD.pack(levelno, offset))
+					offset += len(line)
+
+	def emit(self, record):
+		try:
+			if self.shouldRollover(record):
+				self.doRollover()
+			if self.stream is None:
+				self.stream = self._open()
+			offset = self.stream.tell()
+			logging.FileHandler.emit(self, record)
+			# Written after the line is flushed, so the index never points past the file
+			self._index.write(INDEX_RECORD.pack(min(record.levelno, 255), offset))
+			self._index.flush()
+		except Exception:
+			self.handleError(record)
+
+	def doRollover(self):
+		super().doRollover()
+		# Rotated backups are scanned; the index only covers the live file
+		self._index.close()
+		self._index = self.index_path.open("wb")
+
+	def close(self):
+		self.acquire()
+		try:
+			self._index.close()
+		finally:
+			self.release()
+		super().close()
+
+
 def configure_logging() -> logging.Logger:
 	"""Configure root logger for the Booking Services API.
 
-	- Logs to console and a rotating file (prod_logs.log)
+	- Logs to console and a rotating file (prod_logs.log, one per worker process)
+	- Callers only enqueue records; a background listener thread does the I/O
 	- Uses a structured, single-line formatter with ISO timestamps and file information
 	"""
 	logger = logging.getLogger("BookingServicesAPI")
@@ -19,17 +136,17 @@ def configure_logging() -> logging.Logger:
 
 	logger.setLevel(logging.INFO)
 
+	log_path = log_file_path()
 	# Ensure directory exists
-	LOG_FILE_PATH.parent.mkdir(parents=True, exist_ok=True)
+	log_path.parent.mkdir(parents=True, exist_ok=True)
 
-	formatter = logging.Formatter(
+	formatter = FastFormatter(
 		fmt="%(asctime)s [%(levelname)s] %(name)s - %(filename)s:%(lineno)d - %(message)s",
-		datefmt="%Y-%m-%dT%H:%M:%S.%fZ",
 	)
 
-	# File handler with rotation
-	file_handler = RotatingFileHandler(
-		LOG_FILE_PATH,
+	# File handler with rotation and level index; this process is its only writer
+	file_handler = IndexedRotatingFileHandler(
+		log_path,
 		maxBytes=5 * 1024 * 1024,  # 5 MB
 		backupCount=5,
 		encoding="utf-8",
@@ -42,8 +159,12 @@ def configure_logging() -> logging.Logger:
 	console_handler.setFormatter(formatter)
 	console_handler.setLevel(logging.INFO)
 
-	logger.addHandler(file_handler)
-	logger.addHandler(console_handler)
+	log_queue = queue.Queue(-1)
+	listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+	listener.start()
+	# Drain queued records before the interpreter exits
+	atexit.register(listener.stop)
+	logger.addHandler(QueueHandler(log_queue))
 
 	# Reduce noise from third-party libs if needed
 	logging.getLogger("uvicorn").setLevel(logging.WARNING)